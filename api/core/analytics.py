@@ -0,0 +1,103 @@
+import numpy as np
+from api.core.records import UNKNOWN_DATE, ZONES
+
+METRICS = ("calories_burned", "splat_points", "active_time")
+PERCENTILES = (50, 90)
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+class WorkoutColumns:
+    """Columnar, array-backed view of a member's workout history.
+
+    One ``from_records`` pass fills typed arrays; every aggregate after that
+    is a vectorized NumPy kernel instead of a Python loop over records.
+    """
+
+    def __init__(self, metrics, zones, days, class_codes, class_names):
+        self.metrics = metrics            # float64, shape (len(METRICS), n)
+        self.zones = zones                # float64, shape (n, len(ZONES))
+        self.days = days                  # datetime64[D], NaT for unknown dates
+        self.class_codes = class_codes    # int32 index into class_names
+        self.class_names = class_names
+
+    @classmethod
+    def from_records(cls, records):
+        n = len(records)
+        class_index = {}
+        metrics = np.array(
+            [[record[name] or 0 for name in METRICS] for record in records], dtype=np.float64
+        ).reshape(n, len(METRICS)).T
+        zones = np.array(
+            [[record["zone_time"][zone] or 0 for zone in ZONES] for record in records], dtype=np.float64
+        ).reshape(n, len(ZONES))
+        days = np.array(
+            [record["date"][:10] if record["date"] != UNKNOWN_DATE else "NaT" for record in records],
+            dtype="datetime64[D]"
+        )
+        class_codes = np.array(
+            [class_index.setdefault(record["class_name"], len(class_index)) for record in records],
+            dtype=np.int32
+        )
+        return cls(metrics, zones, days, class_codes, list(class_index))
+
+    def __len__(self):
+        return self.metrics.shape[1]
+
+    def column(self, name):
+        return self.metrics[METRICS.index(name)]
+
+    @property
+    def weekdays(self):
+        """Weekday index per workout, Monday = 0 (-1 for unknown dates)"""
+        weekdays = (self.days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+        return np.where(np.isnat(self.days), -1, weekdays)
+
+    def summary(self):
+        """Sum, mean, max and percentiles per metric plus zone-time shares"""
+        count = len(self)
+        result = {"count": count}
+        if count:
+            sums = self.metrics.sum(axis=1)
+            maxima = self.metrics.max(axis=1)
+            percentiles = np.percentile(self.metrics, PERCENTILES, axis=1)
+        for i, name in enumerate(METRICS):
+            stats = {"sum": 0, "mean": 0, "max": 0, **{f"p{p}": 0 for p in PERCENTILES}}
+            if count:
+                stats = {
+                    "sum": float(sums[i]),
+                    "mean": round(float(sums[i]) / count, 1),
+                    "max": float(maxima[i]),
+                    **{f"p{p}": float(percentiles[j, i]) for j, p in enumerate(PERCENTILES)}
+                }
+            result[name] = stats
+        result["zone_share"] = zone_shares(self.zones.sum(axis=0))
+        return result
+
+    def group_means(self, codes, size, metric):
+        """Per-group count and mean of ``metric`` for non-negative group codes"""
+        valid = codes >= 0
+        counts = np.bincount(codes[valid], minlength=size)
+        totals = np.bincount(codes[valid], weights=self.column(metric)[valid], minlength=size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, totals / np.maximum(counts, 1), 0.0)
+        return counts, means
+
+
+def zone_shares(zone_totals):
+    """Percentage of zone time spent in each heart rate zone"""
+    total = float(np.sum(zone_totals))
+    if total <= 0:
+        return {zone: 0 for zone in ZONES}
+    return {zone: round(float(minutes) / total * 100, 1) for zone, minutes in zip(ZONES, zone_totals)}
+
+
+def longest_run(mask):
+    """Length of the longest run of True values, and of the trailing run"""
+    if not len(mask):
+        return 0, 0
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    runs = edges[1::2] - edges[::2]
+    longest = int(runs.max()) if len(runs) else 0
+    trailing = int(runs[-1]) if len(runs) and mask[-1] else 0
+    return longest, trailing
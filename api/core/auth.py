@@ -1,16 +1,13 @@
-from fastapi import HTTPException, status
+from contextlib import asynccontextmanager
+from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from api.core.config import settings, logger
-from otf_api import Otf
+from api.core.pool import client_pool, member_key
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/login")
 
-async def get_otf_client(credentials):
-    """Create and return an OTF client"""
-    return Otf(credentials["email"], credentials["password"])
-
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -33,4 +30,33 @@ def decode_token(token: str):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired or is invalid",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
+
+@asynccontextmanager
+async def member_client(token: str):
+    """Yield ``(member, otf)`` for the token's member.
+
+    The client is leased from the pool for the duration of the block. Any
+    failure inside it is logged and raised as a 500, and the client is
+    discarded from the pool since its session may be broken.
+    """
+    credentials = decode_token(token)
+    otf = None
+    try:
+        async with client_pool.lease(credentials) as otf:
+            yield member_key(credentials), otf
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        if otf:
+            await client_pool.discard(credentials, otf)
+        raise HTTPException(status_code=500, detail=str(e))
+
+def is_admin(credentials):
+    return member_key(credentials) in settings.ADMIN_EMAILS
+
+def require_admin(token: str = Depends(oauth2_scheme)):
+    """Dependency allowing only members listed in ``ADMIN_EMAILS``"""
+    credentials = decode_token(token)
+    if not is_admin(credentials):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return credentials
@@ -0,0 +1,184 @@
+import asyncio
+import io
+import multiprocessing
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use("Agg")  # Non-interactive backend, no display needed
+from matplotlib.figure import Figure
+import numpy as np
+from api.core.analytics import WEEKDAYS, zone_shares
+from api.core.config import settings, logger
+from api.core.metrics import cache_result, stage_seconds, timed
+from api.core.records import ZONES
+from api.core.singleflight import SingleFlight
+
+MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+COLORS = ["#f58220", "#1e88e5", "#43a047", "#e53935", "#5e35b1"]
+ZONE_COLORS = {"gray": "#9e9e9e", "blue": "#1e88e5", "green": "#43a047", "orange": "#f58220", "red": "#e53935"}
+
+# Bump when chart code changes so cached images and ETags are refreshed
+CHART_VERSION = "1"
+
+
+def chart_data(name, history):
+    """The small, picklable inputs a chart needs, derived from a member's history"""
+    columns = history.columns
+    dated = ~np.isnat(columns.days)
+    if name == "yearly_overview":
+        years, counts = np.unique(columns.days[dated].astype("datetime64[Y]"), return_counts=True)
+        return {"years": years.astype(str).tolist(), "counts": counts.tolist()}
+    if name == "performance_dashboard":
+        order = np.argsort(columns.days[dated], kind="stable")
+        days = columns.days[dated][order]
+        months, month_counts = np.unique(days.astype("datetime64[M]"), return_counts=True)
+        return {
+            "days": days,
+            "calories": columns.column("calories_burned")[dated][order],
+            "splats": columns.column("splat_points")[dated][order],
+            "active_minutes": columns.column("active_time")[dated][order] / 60,
+            "zone_share": zone_shares(columns.zones.sum(axis=0)),
+            "months": months.astype("datetime64[D]"),
+            "month_counts": month_counts,
+        }
+    if name == "day_of_week":
+        _, calories = columns.group_means(columns.weekdays, len(WEEKDAYS), "calories_burned")
+        _, splats = columns.group_means(columns.weekdays, len(WEEKDAYS), "splat_points")
+        return {"calories": calories.tolist(), "splats": splats.tolist()}
+    if name == "studio_visits":
+        return dict(Counter(workout["studio"] for workout in history.workouts).most_common())
+    raise ValueError(f"Unknown chart: {name}")
+
+
+def _yearly_overview(fig, data):
+    ax = fig.subplots()
+    ax.bar(data["years"], data["counts"], color=COLORS[0])
+    ax.set_title("Classes per Year", fontsize=14, pad=20)
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Number of Classes")
+    ax.grid(True, axis="y", alpha=0.3)
+
+
+def _performance_dashboard(fig, data):
+    axes = fig.subplots(2, 2)
+    fig.suptitle("Performance Dashboard", fontsize=16)
+
+    axes[0, 0].plot(data["days"], data["splats"], label="Splat Points", color=COLORS[0])
+    axes[0, 0].plot(data["days"], data["calories"], label="Calories", color=COLORS[1])
+    axes[0, 0].set_title("Splat Points and Calories")
+    axes[0, 0].legend()
+    axes[0, 0].grid(True, alpha=0.3)
+
+    shares = [data["zone_share"][zone] for zone in ZONES]
+    if sum(shares):
+        axes[0, 1].pie(shares, labels=ZONES, colors=[ZONE_COLORS[zone] for zone in ZONES], autopct="%1.1f%%")
+    axes[0, 1].set_title("Time in Zones")
+
+    axes[1, 0].plot(data["days"], data["active_minutes"], color=COLORS[2])
+    axes[1, 0].set_title("Active Minutes")
+    axes[1, 0].grid(True, alpha=0.3)
+
+    axes[1, 1].bar(data["months"], data["month_counts"], width=20, color=COLORS[4])  # Width in days
+    axes[1, 1].set_title("Classes per Month")
+    axes[1, 1].grid(True, axis="y", alpha=0.3)
+
+
+def _day_of_week(fig, data):
+    ax = fig.subplots()
+    x = np.arange(len(WEEKDAYS))
+    ax.bar(x - 0.2, data["splats"], width=0.4, label="Splat Points", color=COLORS[0])
+    # Scale calories to fit on same plot
+    ax.bar(x + 0.2, np.array(data["calories"]) / 10, width=0.4, label="Calories (÷10)", color=COLORS[1])
+    ax.set_xticks(x, WEEKDAYS, rotation=45)
+    ax.set_title("Performance by Day of Week", fontsize=14, pad=20)
+    ax.set_ylabel("Average")
+    ax.legend()
+    ax.grid(True, axis="y", alpha=0.3)
+
+
+def _studio_visits(fig, data):
+    ax = fig.subplots()
+    studios = list(data)[::-1]  # Most visited on top
+    ax.barh(studios, [data[studio] for studio in studios], color=COLORS[0])
+    ax.set_title("Total Visits by Studio", fontsize=14, pad=20)
+    ax.set_xlabel("Number of Visits")
+    ax.grid(True, axis="x", alpha=0.3)
+
+
+_CHARTS = {
+    "yearly_overview": (_yearly_overview, (12, 6)),
+    "performance_dashboard": (_performance_dashboard, (15, 12)),
+    "day_of_week": (_day_of_week, (12, 6)),
+    "studio_visits": (_studio_visits, (12, 8)),
+}
+
+
+def render_chart(name, data, fmt):
+    """Render one chart to PNG or SVG bytes.
+
+    Builds its own ``Figure`` with no pyplot state, so it is safe to run in
+    a worker process.
+    """
+    draw, figsize = _CHARTS[name]
+    fig = Figure(figsize=figsize)
+    draw(fig, data)
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+class ChartRenderer:
+    """Renders charts on a process pool and keeps recent images in memory.
+
+    Images are keyed by the caller (the response ETag, which covers the
+    member's history content, chart, format and chart version), so a
+    repeated request is served without rendering. Concurrent requests for
+    the same image share one render.
+    """
+
+    def __init__(self, max_workers, max_images):
+        self.max_workers = max_workers
+        self.max_images = max_images
+        self._images = OrderedDict()
+        self._flights = SingleFlight()
+        self._executor = None
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            # Spawned workers don't inherit the server's event loop or sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def render(self, key, name, build_data, fmt):
+        """Return the image for ``key``, rendering ``build_data()`` on a miss"""
+        image = self._images.get(key)
+        cache_result("charts", image is not None)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+        return await self._flights.do(key, lambda: self._render(key, name, build_data, fmt))
+
+    async def _render(self, key, name, build_data, fmt):
+        loop = asyncio.get_running_loop()
+        with timed(stage_seconds, stage="chart_render"):
+            image = await loop.run_in_executor(self.executor, render_chart, name, build_data(), fmt)
+        self._images[key] = image
+        while len(self._images) > self.max_images:
+            self._images.popitem(last=False)
+        return image
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+            logger.info("Chart render pool shut down")
+
+
+chart_renderer = ChartRenderer(
+    max_workers=settings.CHART_RENDER_WORKERS,
+    max_images=settings.CHART_CACHE_SIZE
+)
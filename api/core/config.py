@@ -18,4 +18,53 @@ class Settings:
     API_DESCRIPTION: str = "API for accessing OrangeTheory Fitness workout data and member information."
     API_VERSION: str = "1.0.0"
 
+    # OTF client pool
+    OTF_CLIENT_POOL_SIZE: int = int(os.getenv("OTF_CLIENT_POOL_SIZE", "100"))
+    OTF_CLIENT_IDLE_TTL_SECONDS: int = int(os.getenv("OTF_CLIENT_IDLE_TTL_SECONDS", "900"))
+
+    # Workout history cache
+    WORKOUT_HISTORY_TTL_SECONDS: int = int(os.getenv("WORKOUT_HISTORY_TTL_SECONDS", "300"))
+    WORKOUT_HISTORY_DELTA_LIMIT: int = int(os.getenv("WORKOUT_HISTORY_DELTA_LIMIT", "25"))
+    WORKOUT_HISTORY_FULL_LIMIT: int = int(os.getenv("WORKOUT_HISTORY_FULL_LIMIT", "5000"))
+    WORKOUT_HISTORY_CACHE_SIZE: int = int(os.getenv("WORKOUT_HISTORY_CACHE_SIZE", "500"))
+    PREFETCH_ON_LOGIN: bool = os.getenv("PREFETCH_ON_LOGIN", "true").lower() == "true"
+    MEMBER_DETAIL_TTL_SECONDS: int = int(os.getenv("MEMBER_DETAIL_TTL_SECONDS", "300"))
+
+    # Upstream OTF API scheduling. Rate, burst and concurrency are totals for
+    # the host and are split evenly between the WEB_CONCURRENCY workers.
+    WORKERS: int = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+    UPSTREAM_RATE_PER_SECOND: float = float(os.getenv("UPSTREAM_RATE_PER_SECOND", "10"))
+    UPSTREAM_BURST: int = int(os.getenv("UPSTREAM_BURST", "20"))
+    UPSTREAM_MAX_CONCURRENCY: int = int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "16"))
+    UPSTREAM_MEMBER_CONCURRENCY: int = int(os.getenv("UPSTREAM_MEMBER_CONCURRENCY", "2"))
+    # Logins (including unauthenticated attempts) get their own, smaller budget
+    UPSTREAM_LOGIN_RATE_PER_SECOND: float = float(os.getenv("UPSTREAM_LOGIN_RATE_PER_SECOND", "2"))
+    UPSTREAM_LOGIN_BURST: int = int(os.getenv("UPSTREAM_LOGIN_BURST", "5"))
+    UPSTREAM_LOGIN_MAX_CONCURRENCY: int = int(os.getenv("UPSTREAM_LOGIN_MAX_CONCURRENCY", "4"))
+
+    # Response compression
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 5
+
+    # Chart rendering
+    CHART_RENDER_WORKERS: int = int(os.getenv("CHART_RENDER_WORKERS", "2"))
+    CHART_CACHE_SIZE: int = int(os.getenv("CHART_CACHE_SIZE", "256"))
+
+    # Durable workout store
+    WORKOUT_DB_PATH: str = os.getenv("WORKOUT_DB_PATH", "otf_workouts.db")
+
+    # Cache shared by all uvicorn workers on the host
+    SHARED_CACHE_PATH: str = os.getenv("SHARED_CACHE_PATH", "otf_cache.db")
+    SHARED_CACHE_MMAP_BYTES: int = int(os.getenv("SHARED_CACHE_MMAP_BYTES", str(64 * 1024 * 1024)))
+
+    # Accounts allowed to use the admin endpoints, comma separated
+    ADMIN_EMAILS: set = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+
+    # Opt-in request profiling
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_INTERVAL_SECONDS: float = float(os.getenv("PROFILE_INTERVAL_SECONDS", "0.001"))
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "profiles")
+    PROFILE_MAX_COUNT: int = int(os.getenv("PROFILE_MAX_COUNT", "100"))
+
 settings = Settings()
\ No newline at end of file
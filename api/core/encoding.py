@@ -0,0 +1,145 @@
+import gzip
+import brotli
+import msgpack
+import orjson
+from fastapi import Request, Response
+from api.core.config import settings
+from api.core.metrics import payload_bytes, stage_seconds, timed
+from api.core.etag import CACHE_CONTROL, content_etag, is_not_modified, not_modified
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+_ALIASES = {MSGPACK_MEDIA_TYPE: (MSGPACK_MEDIA_TYPE, "application/x-msgpack")}
+# Supported content codings, most preferred first
+_CODINGS = ("br", "gzip")
+
+# Repetitive string columns worth sending as a dictionary plus integer codes
+DICTIONARY_FIELDS = ("class_name", "class_type", "coach", "studio")
+
+VARY = "Accept, Accept-Encoding"
+
+
+def _qvalues(header):
+    """Map each value listed in an ``Accept``-style header to its q-value.
+
+    Values with a malformed q-value count as refused (q=0).
+    """
+    qvalues = {}
+    for item in header.split(","):
+        value, *params = item.split(";")
+        value = value.strip().lower()
+        if not value:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, raw = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(raw.strip())
+                except ValueError:
+                    q = 0.0
+        qvalues[value] = max(q, qvalues.get(value, 0.0))
+    return qvalues
+
+
+def negotiate_media_type(request: Request, offers=(MSGPACK_MEDIA_TYPE,)):
+    """Pick the response media type from ``Accept``.
+
+    ``offers`` are the media types served besides JSON, most preferred
+    first. One is used when it is explicitly accepted at least as strongly
+    as JSON and any offer listed before it; otherwise the response is JSON.
+    """
+    accept = _qvalues(request.headers.get("accept", ""))
+    media_type, best_q = JSON_MEDIA_TYPE, accept.get(JSON_MEDIA_TYPE, 0.0)
+    for offer in reversed(offers):
+        q = max(accept.get(alias, 0.0) for alias in _ALIASES.get(offer, (offer,)))
+        if q > 0 and q >= best_q:
+            media_type, best_q = offer, q
+    return media_type
+
+
+def negotiate_coding(request: Request):
+    """Pick the content coding from ``Accept-Encoding``.
+
+    Returns ``(coding, identity_ok)``. The supported coding with the highest
+    q-value is used when it is at least as acceptable as no coding, with
+    brotli winning ties; ``*`` stands for every coding not listed. An
+    uncoded body stays acceptable unless ``identity`` (or ``*`` without an
+    ``identity`` entry) has ``q=0``.
+    """
+    codings = _qvalues(request.headers.get("accept-encoding", ""))
+    wildcard_q = codings.get("*", 0.0)
+    identity_q = codings.get("identity", codings.get("*", 1.0))
+    coding, best_q = None, 0.0
+    for candidate in _CODINGS:
+        q = codings.get(candidate, wildcard_q)
+        if q > best_q:
+            coding, best_q = candidate, q
+    if coding is not None and best_q < identity_q:
+        coding = None
+    return coding, identity_q > 0
+
+
+def encode_columns(records, fields):
+    """Column-oriented form of workout records for binary payloads.
+
+    Each field becomes one list; ``DICTIONARY_FIELDS`` are sent as a
+    ``dictionary`` of distinct values plus per-row integer ``codes`` and
+    ``zone_time`` becomes one list per zone.
+    """
+    columns = {}
+    for field in fields:
+        if field == "zone_time":
+            zones = records[0]["zone_time"].keys() if records else ()
+            columns[field] = {zone: [record["zone_time"][zone] for record in records] for zone in zones}
+        elif field in DICTIONARY_FIELDS:
+            dictionary = {}
+            codes = [dictionary.setdefault(record[field], len(dictionary)) for record in records]
+            columns[field] = {"dictionary": list(dictionary), "codes": codes}
+        else:
+            columns[field] = [record[field] for record in records]
+    return {"count": len(records), "columns": columns}
+
+
+def _serialize(content, media_type):
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(content, use_bin_type=True)
+    return orjson.dumps(content)
+
+
+def _compress(body, coding, min_size):
+    if coding is None or len(body) < min_size:
+        return body, None
+    if coding == "br":
+        return brotli.compress(body, quality=settings.BROTLI_QUALITY), coding
+    return gzip.compress(body, compresslevel=settings.GZIP_LEVEL), coding
+
+
+def negotiated_response(request: Request, etag_parts, build_content):
+    """Conditional, content-negotiated response.
+
+    ``build_content(media_type)`` is only called when the client's copy is
+    stale. The body is JSON or MessagePack per ``Accept`` and is compressed
+    with brotli or gzip per ``Accept-Encoding`` once it is large enough, or
+    always when the client refuses an uncoded body. Each representation
+    gets its own ETag.
+    """
+    media_type = negotiate_media_type(request)
+    coding, identity_ok = negotiate_coding(request)
+    etag = content_etag(*etag_parts, media_type, coding or "identity")
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": VARY}
+    if is_not_modified(request, etag):
+        return not_modified(etag, headers)
+
+    with timed(stage_seconds, stage="build_content"):
+        content = build_content(media_type)
+    with timed(stage_seconds, stage="serialize"):
+        body = _serialize(content, media_type)
+    payload_bytes.labels(media_type=media_type, coding="identity").inc(len(body))
+    with timed(stage_seconds, stage="compress"):
+        body, coding = _compress(body, coding, settings.COMPRESSION_MIN_SIZE if identity_ok else 0)
+    if coding:
+        payload_bytes.labels(media_type=media_type, coding=coding).inc(len(body))
+        headers["Content-Encoding"] = coding
+    return Response(body, media_type=media_type, headers=headers)
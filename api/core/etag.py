@@ -0,0 +1,30 @@
+import hashlib
+from fastapi import Request, Response
+from api.core.metrics import cache_result
+
+# Browsers may keep the body but must revalidate it with If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+def content_etag(*parts):
+    """Build a strong ETag from strings describing the response content"""
+    digest = hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def is_not_modified(request: Request, etag):
+    """Whether the request's If-None-Match already matches ``etag``"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    matched = "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+    cache_result("etag", matched)
+    return matched
+
+
+def not_modified(etag, headers=None):
+    """Empty 304 response for a client whose copy is current"""
+    return Response(status_code=304, headers=headers or {"ETag": etag, "Cache-Control": CACHE_CONTROL})
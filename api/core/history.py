@@ -0,0 +1,264 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from functools import cached_property
+import orjson
+from api.core.config import settings, logger
+from api.core.metrics import cache_result, stage_seconds, timed
+from api.core.records import combine_summaries, cursor_for, order_key, sort_key, workout_to_dict, total_classes_to_dict
+from api.core.analytics import WorkoutColumns
+from api.core.scheduler import upstream_scheduler
+from api.core.shared import shared_cache
+from api.core.singleflight import upstream_flights
+from api.core.store import workout_store
+from api.core.trends import compute_trends
+
+
+class MemberHistory:
+    """A member's workout records, newest first, plus their class totals"""
+
+    def __init__(self, workouts, total_classes, synced_at=None, generation=None):
+        self.workouts = workouts
+        self.total_classes = total_classes
+        self.synced_at = synced_at if synced_at is not None else time.time()
+        self.generation = generation  # Shared-cache generation this copy was built at
+        self.persisted = False  # Whether the workout store holds exactly these workouts
+
+    @property
+    def date_range(self):
+        return {
+            "first_class": self.workouts[-1]["date"] if self.workouts else "Unknown",
+            "last_class": self.workouts[0]["date"] if self.workouts else "Unknown"
+        }
+
+    @cached_property
+    def content_hash(self):
+        """Stable hash of the history content, computed once per sync"""
+        return hashlib.sha256(orjson.dumps([self.total_classes, self.workouts])).hexdigest()
+
+    @cached_property
+    def columns(self):
+        """Array-backed view of the workouts for vectorized analytics"""
+        return WorkoutColumns.from_records(self.workouts)
+
+    @cached_property
+    def trends(self):
+        """Trend aggregates, computed once per synced history"""
+        return compute_trends(self.columns)
+
+    def page(self, before=None, limit=None):
+        """Return ``(workouts, next_cursor)`` for workouts after the ``before`` cursor.
+
+        ``before`` is a parsed ``(starts_at, id)`` cursor. Workouts are newest
+        first and ordered by start time then id, so workouts sharing a start
+        time are never skipped. ``next_cursor`` points past the last workout
+        on the page and is None once the history is exhausted.
+        """
+        start = 0
+        if before is not None:
+            lo, hi = 0, len(self.workouts)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if order_key(self.workouts[mid]) >= before:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            start = lo
+        end = len(self.workouts) if limit is None else min(start + limit, len(self.workouts))
+        workouts = self.workouts[start:end]
+        next_cursor = cursor_for(workouts[-1]) if workouts and end < len(self.workouts) else None
+        return workouts, next_cursor
+
+    def is_fresh(self, ttl):
+        return time.time() - self.synced_at < ttl
+
+
+def merge_workouts(known, fetched):
+    """Merge freshly fetched records into known ones.
+
+    Returns the merged newest-first list and whether the fetched page reached
+    back to workouts that were already known, i.e. whether the delta is
+    complete.
+    """
+    if not known:
+        return sorted(fetched, key=order_key, reverse=True), False
+
+    newest_known = sort_key(known[0])
+    known_ids = {record["id"] for record in known}
+    overlaps = any(
+        record["id"] in known_ids or sort_key(record) <= newest_known
+        for record in fetched
+    )
+    # Fetched records win so late-arriving details replace stale ones
+    by_id = {record["id"]: record for record in known}
+    by_id.update((record["id"], record) for record in fetched)
+    return sorted(by_id.values(), key=order_key, reverse=True), overlaps
+
+
+class WorkoutHistoryCache:
+    """Per-member workout history cache with incremental upstream sync.
+
+    Within ``ttl`` seconds a member's cached history is served as is. After
+    that, or on a forced refresh, only the newest ``delta_limit`` summaries
+    are fetched and merged in; a full fetch happens on a cold cache or when
+    the delta page doesn't reach back to a workout already seen. Synced records
+    are persisted to the workout store, which backs in-memory misses after a
+    restart or on another worker.
+
+    Every sync bumps the member's generation in the shared cache. A worker
+    whose in-memory copy is from an older generation reloads it from the
+    store instead of serving stale data or calling upstream again, and
+    computed trends are shared between workers the same way.
+    """
+
+    def __init__(self, ttl, delta_limit, full_limit, max_members):
+        self.ttl = ttl
+        self.delta_limit = delta_limit
+        self.full_limit = full_limit
+        self.max_members = max_members
+        self._entries = OrderedDict()
+
+    def _store(self, member, history):
+        self._entries[member] = history
+        self._entries.move_to_end(member)
+        while len(self._entries) > self.max_members:
+            self._entries.popitem(last=False)
+
+    async def get(self, member, otf, refresh=False):
+        """Return the member's history, syncing from upstream when stale.
+
+        Concurrent syncs for the same member share one upstream fetch, which
+        runs at the most urgent priority of the callers waiting on it.
+        """
+        if not refresh:
+            cached = self._entries.get(member)
+            if cached and cached.is_fresh(self.ttl) and await self._is_current(member, cached):
+                self._entries.move_to_end(member)
+                cache_result("history", True)
+                return cached
+        cache_result("history", False)
+        with upstream_scheduler.expedite(member):
+            return await upstream_flights.do(
+                ("history", member, refresh), lambda: self._sync(member, otf, refresh)
+            )
+
+    async def _sync(self, member, otf, refresh):
+        cached = self._entries.get(member)
+        if cached is None or not await self._is_current(member, cached):
+            # Another worker may have synced since; its result is in the store
+            cached = await self._load(member)
+        if cached and not refresh and cached.is_fresh(self.ttl):
+            return cached
+
+        if cached:
+            fetched, total_classes = await self._fetch(member, otf, self.delta_limit)
+            workouts, complete = merge_workouts(cached.workouts, fetched)
+            if complete or len(fetched) < self.delta_limit:
+                logger.info(f"Synced {len(workouts) - len(cached.workouts)} new workouts for: {member}")
+                history = MemberHistory(workouts, total_classes)
+                await self._save(member, history, fetched, replace=False)
+                return history
+            logger.info(f"Delta sync did not overlap cached history, doing full fetch for: {member}")
+
+        fetched, total_classes = await self._fetch(member, otf, self.full_limit)
+        history = MemberHistory(sorted(fetched, key=order_key, reverse=True), total_classes)
+        await self._save(member, history, history.workouts, replace=True)
+        return history
+
+    async def trends(self, member, history):
+        """Trend aggregates for ``history``, shared across workers.
+
+        A worker that finds trends for the same history content in the shared
+        cache reuses them instead of recomputing.
+        """
+        if "trends" in history.__dict__:
+            cache_result("trends", True)
+            return history.trends
+        try:
+            shared = await asyncio.to_thread(shared_cache.get, "trends", member)
+        except Exception as e:
+            logger.warning(f"Error reading shared trends for {member}: {str(e)}")
+            shared = None
+        if shared and shared["content_hash"] == history.content_hash:
+            history.__dict__["trends"] = shared["trends"]  # Fill the cached_property
+            cache_result("trends", True)
+            return history.trends
+
+        cache_result("trends", False)
+        with timed(stage_seconds, stage="trends"):
+            trends = history.trends
+        try:
+            await asyncio.to_thread(
+                shared_cache.set, "trends", member, {"content_hash": history.content_hash, "trends": trends}
+            )
+        except Exception as e:
+            logger.warning(f"Error sharing trends for {member}: {str(e)}")
+        return trends
+
+    async def _generation(self, member):
+        """The member's shared generation, or None if the shared cache is unavailable"""
+        try:
+            return await asyncio.to_thread(shared_cache.generation, member)
+        except Exception as e:
+            logger.warning(f"Error reading shared generation for {member}: {str(e)}")
+            return None
+
+    async def _is_current(self, member, history):
+        generation = await self._generation(member)
+        return generation is None or generation == history.generation
+
+    async def _bump(self, member):
+        try:
+            return await asyncio.to_thread(shared_cache.bump, member)
+        except Exception as e:
+            logger.warning(f"Error bumping shared generation for {member}: {str(e)}")
+            return None
+
+    async def _load(self, member):
+        """Warm the in-memory entry from the durable store"""
+        # Read the generation first so a concurrent sync makes this copy look stale, not current
+        generation = await self._generation(member)
+        try:
+            stored = await asyncio.to_thread(workout_store.load, member)
+        except Exception as e:
+            logger.warning(f"Error loading stored history for {member}: {str(e)}")
+            return None
+        if stored is None:
+            return None
+        history = MemberHistory(*stored, generation=generation)
+        history.persisted = True
+        self._store(member, history)
+        return history
+
+    async def _save(self, member, history, records, replace):
+        """Keep the synced history in memory, persist the changed records and notify other workers"""
+        self._store(member, history)
+        try:
+            await asyncio.to_thread(
+                workout_store.save, member, records, history.total_classes, history.synced_at, replace
+            )
+        except Exception as e:
+            logger.warning(f"Error persisting history for {member}: {str(e)}")
+            return
+        history.persisted = True
+        history.generation = await self._bump(member)
+
+    async def _fetch(self, member, otf, limit):
+        summaries, total_classes = await asyncio.gather(
+            upstream_scheduler.call(
+                member, lambda: otf.get_performance_summaries(limit=limit), name="get_performance_summaries"
+            ),
+            upstream_scheduler.call(member, otf.get_total_classes, name="get_total_classes")
+        )
+        with timed(stage_seconds, stage="history_build"):
+            workouts = [workout_to_dict(w) for w in combine_summaries(summaries)]
+        return workouts, total_classes_to_dict(total_classes)
+
+
+history_cache = WorkoutHistoryCache(
+    ttl=settings.WORKOUT_HISTORY_TTL_SECONDS,
+    delta_limit=settings.WORKOUT_HISTORY_DELTA_LIMIT,
+    full_limit=settings.WORKOUT_HISTORY_FULL_LIMIT,
+    max_members=settings.WORKOUT_HISTORY_CACHE_SIZE
+)
@@ -0,0 +1,97 @@
+import asyncio
+import json
+from fastapi import HTTPException
+from api.core.config import settings, logger
+from api.core.etag import content_etag
+from api.core.metrics import cache_result
+from api.core.scheduler import upstream_scheduler
+from api.core.shared import shared_cache
+from api.core.singleflight import upstream_flights
+from api.models.schemas import MemberDetailResponse, MemberDetail, WorkoutStats, StudioInfo
+
+
+async def fetch_member_detail(member, otf):
+    """Fetch the member profile and return its response body and ETag"""
+    member_detail = await upstream_scheduler.call(member, otf.get_member_detail, name="get_member_detail")
+
+    # Debug logs
+    logger.info(f"Member Class Summary: {member_detail.member_class_summary}")
+    logger.info(f"Home Studio: {member_detail.home_studio}")
+    logger.info(f"Max HR: {member_detail.max_hr}")
+
+    # Calculate rates
+    attendance_rate = (
+        member_detail.member_class_summary.total_classes_attended / 
+        member_detail.member_class_summary.total_classes_booked * 100
+    ) if member_detail.member_class_summary.total_classes_booked > 0 else 0
+
+    hrm_usage_rate = (
+        member_detail.member_class_summary.total_classes_used_hrm / 
+        member_detail.member_class_summary.total_classes_attended * 100
+    ) if member_detail.member_class_summary.total_classes_attended > 0 else 0
+
+    # Create response with explicit error handling
+    try:
+        response_data = MemberDetail(
+            # Basic Info
+            first_name=member_detail.first_name,
+            last_name=member_detail.last_name,
+            email=member_detail.email,
+
+            # Fitness Profile
+            max_hr=member_detail.max_hr,
+
+            # Stats
+            workout_stats=WorkoutStats(
+                total_classes_booked=member_detail.member_class_summary.total_classes_booked,
+                total_classes_attended=member_detail.member_class_summary.total_classes_attended,
+                total_classes_with_hrm=member_detail.member_class_summary.total_classes_used_hrm,
+                attendance_rate=round(attendance_rate, 1),
+                hrm_usage_rate=round(hrm_usage_rate, 1),
+                first_class_date=member_detail.member_class_summary.first_visit_date,
+                last_class_date=member_detail.member_class_summary.last_class_visited_date
+            ),
+            studio_info=StudioInfo(
+                home_studio_name=member_detail.home_studio.studio_name,
+                total_studios_visited=member_detail.member_class_summary.total_studios_visited,
+                time_zone=member_detail.home_studio.time_zone
+            )
+        )
+        logger.info(f"Response Data: {response_data}")
+        response = MemberDetailResponse(status="success", data=response_data)
+
+    except Exception as model_error:
+        logger.error(f"Error creating response model: {str(model_error)}")
+        raise HTTPException(status_code=500, detail=f"Error creating response: {str(model_error)}")
+
+    body = response.model_dump(mode="json")
+    return body, content_etag(json.dumps(body, sort_keys=True))
+
+
+async def get_member_detail(member, otf, refresh=False):
+    """Return the member's cached ``(body, etag)``, fetching it on a miss.
+
+    The profile is kept in the shared cache, so a fetch on one worker serves
+    every worker until it expires. Concurrent misses for the same member
+    share one upstream call.
+    """
+    if not refresh:
+        try:
+            cached = await asyncio.to_thread(shared_cache.get, "member_detail", member)
+        except Exception as e:
+            logger.warning(f"Error reading shared member detail for {member}: {str(e)}")
+            cached = None
+        cache_result("member_detail", cached is not None)
+        if cached is not None:
+            body, etag = cached
+            return body, etag
+
+    with upstream_scheduler.expedite(member):
+        body, etag = await upstream_flights.do(("member_detail", member), lambda: fetch_member_detail(member, otf))
+    try:
+        await asyncio.to_thread(
+            shared_cache.set, "member_detail", member, [body, etag], settings.MEMBER_DETAIL_TTL_SECONDS
+        )
+    except Exception as e:
+        logger.warning(f"Error caching member detail for {member}: {str(e)}")
+    return body, etag
@@ -0,0 +1,94 @@
+import os
+import time
+from contextlib import contextmanager
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+# Byte-sized buckets for payloads, from 256 B to 16 MB
+_SIZE_BUCKETS = tuple(256 * 4 ** i for i in range(9))
+
+http_request_seconds = Histogram(
+    "otf_http_request_duration_seconds", "API request latency by route", ("method", "route", "status")
+)
+http_response_bytes = Histogram(
+    "otf_http_response_bytes", "API response body size by route", ("route",), buckets=_SIZE_BUCKETS
+)
+upstream_call_seconds = Histogram(
+    "otf_upstream_call_duration_seconds", "OTF API call latency, excluding queueing", ("call", "outcome")
+)
+upstream_wait_seconds = Histogram(
+    "otf_upstream_queue_seconds", "Time OTF API calls waited for the scheduler", ("priority",)
+)
+stage_seconds = Histogram(
+    "otf_stage_duration_seconds", "Time spent in in-process work such as record building and serialization",
+    ("stage",)
+)
+cache_requests = Counter("otf_cache_requests_total", "Cache lookups by cache and result", ("cache", "result"))
+payload_bytes = Counter(
+    "otf_payload_bytes_total", "Serialized payload bytes before and after compression", ("media_type", "coding")
+)
+
+
+@contextmanager
+def timed(histogram, **labels):
+    """Observe the block's duration on ``histogram`` with ``labels``"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - started)
+
+
+def cache_result(cache, hit):
+    cache_requests.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def render_metrics():
+    """Return ``(body, content_type)`` in the Prometheus text format.
+
+    With ``PROMETHEUS_MULTIPROC_DIR`` set (several uvicorn workers), the
+    samples of every worker are aggregated.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and body size per route.
+
+    Routes are labelled by their path template (``/api/charts/{name}``) so
+    label cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        response = {"status": 500, "size": None}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name == b"content-length":
+                        response["size"] = int(value)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            http_request_seconds.labels(
+                method=scope["method"], route=path, status=str(response["status"])
+            ).observe(time.perf_counter() - started)
+            if response["size"] is not None:
+                http_response_bytes.labels(route=path).observe(response["size"])
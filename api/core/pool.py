@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import hmac
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from api.core.config import settings, logger
+from api.core.scheduler import login_scheduler
+from api.core.singleflight import SingleFlight
+from otf_api import Otf
+
+
+async def close_otf_client(otf):
+    """Close the HTTP session held by an OTF client"""
+    if otf and hasattr(otf, 'session') and otf.session:
+        await otf.session.close()
+
+
+def member_key(credentials):
+    """Cache key identifying a member across pooled clients and caches"""
+    return credentials["email"].strip().lower()
+
+
+def _password_digest(password):
+    return hashlib.sha256(password.encode()).digest()
+
+
+class _PooledClient:
+    def __init__(self, client, password_digest):
+        self.client = client
+        self.password_digest = password_digest
+        self.last_used = time.monotonic()
+        self.leases = 0  # Requests currently using the client
+        self.retired = False  # Out of the pool, closed once the last lease ends
+
+
+class OtfClientPool:
+    """LRU pool of authenticated OTF clients keyed by member email.
+
+    A pooled client keeps its HTTP session and auth tokens alive between
+    requests (the OTF client refreshes its own tokens), so steady-state
+    requests skip the upstream login. Clients idle for longer than
+    ``idle_ttl`` seconds and the least recently used client past
+    ``max_size`` are dropped from the pool.
+
+    Requests use a client through ``lease()``. A client dropped from the pool
+    (expired, evicted, replaced or discarded) is only closed once no request
+    is still using it.
+    """
+
+    def __init__(self, max_size, idle_ttl, client_factory=Otf):
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.client_factory = client_factory
+        self._clients = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._logins = SingleFlight()
+
+    def __len__(self):
+        return len(self._clients)
+
+    def _retire(self, pooled):
+        """Mark a client dropped from the pool; returns it if it can be closed now"""
+        pooled.retired = True
+        return pooled.client if pooled.leases == 0 else None
+
+    def _pop_expired(self, now):
+        expired = []
+        while self._clients:
+            key, pooled = next(iter(self._clients.items()))
+            if now - pooled.last_used <= self.idle_ttl:
+                break
+            del self._clients[key]
+            expired.append(self._retire(pooled))
+        return expired
+
+    @asynccontextmanager
+    async def lease(self, credentials):
+        """Use the member's pooled client for the duration of the block"""
+        pooled = await self._acquire(credentials)
+        try:
+            yield pooled.client
+        finally:
+            pooled.leases -= 1
+            pooled.last_used = time.monotonic()
+            if pooled.retired and pooled.leases == 0:
+                await self._close(pooled.client)
+
+    async def _acquire(self, credentials):
+        """Lease the member's pooled client, logging in only on a miss.
+
+        A client created with other credentials stays pooled until a login
+        with the new ones succeeds, so a wrong password can't knock out a
+        working session. Logins are upstream calls, so they go through the
+        login scheduler and run outside the pool lock; concurrent misses for
+        the same credentials share one login.
+        """
+        key = member_key(credentials)
+        digest = _password_digest(credentials["password"])
+        while True:
+            to_close = []
+            async with self._lock:
+                to_close.extend(self._pop_expired(time.monotonic()))
+                pooled = self._clients.get(key)
+                if pooled and hmac.compare_digest(pooled.password_digest, digest):
+                    pooled.leases += 1
+                    pooled.last_used = time.monotonic()
+                    self._clients.move_to_end(key)
+                else:
+                    pooled = None
+            await self._close_all(to_close)
+            if pooled is not None:
+                return pooled
+
+            pooled = await self._logins.do((key, digest), lambda: self._login(key, credentials, digest))
+            if not pooled.retired:
+                pooled.leases += 1
+                return pooled
+            # Dropped again before this caller resumed; go round for a fresh one
+
+    async def _login(self, key, credentials, digest):
+        logger.info(f"Creating pooled OTF client for: {key}")
+        client = await login_scheduler.call(key, lambda: self._create(credentials), name="client_login")
+        to_close = []
+
+        async with self._lock:
+            pooled = self._clients.get(key)
+            if pooled and hmac.compare_digest(pooled.password_digest, digest):
+                # Another login for these credentials finished first
+                to_close.append(client)
+            else:
+                if pooled:
+                    # The new credentials work, so the old client can go
+                    to_close.append(self._retire(pooled))
+                pooled = _PooledClient(client, digest)
+                self._clients[key] = pooled
+                self._clients.move_to_end(key)
+                while len(self._clients) > self.max_size:
+                    _, evicted = self._clients.popitem(last=False)
+                    to_close.append(self._retire(evicted))
+
+        await self._close_all(to_close)
+        return pooled
+
+    async def _create(self, credentials):
+        # Creating a client logs in to OTF with blocking I/O, so keep it off the event loop
+        return await asyncio.to_thread(self.client_factory, credentials["email"], credentials["password"])
+
+    async def discard(self, credentials, client):
+        """Drop the member's ``client`` from the pool, e.g. after an upstream failure.
+
+        Does nothing if the pool already holds a different client for the
+        member, so a failed request can't knock out a newer session.
+        """
+        key = member_key(credentials)
+        to_close = []
+        async with self._lock:
+            pooled = self._clients.get(key)
+            if pooled is not None and pooled.client is client:
+                del self._clients[key]
+                to_close.append(self._retire(pooled))
+        await self._close_all(to_close)
+
+    async def close(self):
+        """Close every pooled client"""
+        async with self._lock:
+            clients = [pooled.client for pooled in self._clients.values()]
+            self._clients.clear()
+        await self._close_all(clients)
+
+    async def _close_all(self, clients):
+        for client in clients:
+            if client is not None:
+                await self._close(client)
+
+    async def _close(self, client):
+        try:
+            await close_otf_client(client)
+        except Exception as e:
+            logger.warning(f"Error closing OTF client: {str(e)}")
+
+
+client_pool = OtfClientPool(
+    max_size=settings.OTF_CLIENT_POOL_SIZE,
+    idle_ttl=settings.OTF_CLIENT_IDLE_TTL_SECONDS
+)
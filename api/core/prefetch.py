@@ -0,0 +1,24 @@
+from api.core.config import logger
+from api.core.history import history_cache
+from api.core.members import get_member_detail
+from api.core.pool import client_pool, member_key
+from api.core.scheduler import BACKGROUND, upstream_priority
+
+
+async def prefetch_member_data(credentials):
+    """Warm the member's profile, history and trends caches after login.
+
+    Runs as a background task at background upstream priority, so the
+    member's own dashboard requests overtake it. Failures are logged and the
+    dashboard simply falls back to fetching on demand.
+    """
+    member = member_key(credentials)
+    try:
+        with upstream_priority(BACKGROUND):
+            async with client_pool.lease(credentials) as otf:
+                await get_member_detail(member, otf)
+                history = await history_cache.get(member, otf)
+                await history_cache.trends(member, history)
+        logger.info(f"Prefetched dashboard data for: {member}")
+    except Exception as e:
+        logger.warning(f"Prefetch failed for {member}: {str(e)}")
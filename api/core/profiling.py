@@ -0,0 +1,170 @@
+import asyncio
+import json
+import os
+import random
+import re
+import secrets
+import time
+from datetime import datetime, timezone
+from pyinstrument import Profiler
+from api.core.auth import decode_token, is_admin
+from api.core.config import settings, logger
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+# Profiles of the admin endpoints themselves aren't useful
+_SKIPPED_PREFIXES = ("/api/admin/", "/metrics")
+_PROFILE_ID = re.compile(r"^\d{8}T\d{12}-[0-9a-f]{8}$")
+
+
+class ProfileStore:
+    """Bounded on-disk ring of request profiles.
+
+    Each profile is a pyinstrument HTML report plus a JSON summary. Once
+    there are more than ``max_profiles``, the oldest are deleted. Workers on
+    the same host can share the directory.
+    """
+
+    def __init__(self, directory, max_profiles):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    @staticmethod
+    def new_id():
+        """A unique id that sorts by creation time"""
+        return f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')}-{secrets.token_hex(4)}"
+
+    def _path(self, profile_id, suffix):
+        return os.path.join(self.directory, f"{profile_id}{suffix}")
+
+    def _write(self, path, data):
+        # Write then rename so readers never see a partial file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def save(self, profile_id, html, summary):
+        os.makedirs(self.directory, exist_ok=True)
+        self._write(self._path(profile_id, ".html"), html.encode())
+        self._write(self._path(profile_id, ".json"), json.dumps(summary).encode())
+        self._prune()
+
+    def _ids(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith(".json") and _PROFILE_ID.match(name[:-5]))
+
+    def _prune(self):
+        ids = self._ids()
+        for profile_id in ids[:max(0, len(ids) - self.max_profiles)]:
+            for suffix in (".html", ".json"):
+                try:
+                    os.remove(self._path(profile_id, suffix))
+                except FileNotFoundError:
+                    pass  # Already pruned by another worker
+
+    def list(self):
+        """Summaries of the stored profiles, newest first"""
+        summaries = []
+        for profile_id in reversed(self._ids()):
+            try:
+                with open(self._path(profile_id, ".json")) as f:
+                    summaries.append(json.load(f))
+            except (FileNotFoundError, ValueError):
+                continue
+        return summaries
+
+    def report_path(self, profile_id):
+        """Path of the profile's HTML report, or None if there is no such profile"""
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        path = self._path(profile_id, ".html")
+        return path if os.path.exists(path) else None
+
+
+def _header(scope, name):
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling selected requests with pyinstrument.
+
+    A request is profiled when it is picked at ``sample_rate``, or when an
+    admin sends ``X-Profile: 1``. Profiled responses carry ``X-Profile-Id``
+    and the report is saved to ``store`` after the response is sent. Other
+    requests only pay for the header scan and a random draw.
+    """
+
+    def __init__(self, app, store, sample_rate=0.0, interval=0.001):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.interval = interval
+
+    def _trigger(self, scope):
+        if scope["type"] != "http" or scope["path"].startswith(_SKIPPED_PREFIXES):
+            return None
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        if _header(scope, PROFILE_HEADER) not in ("1", "true"):
+            return None
+        authorization = _header(scope, b"authorization") or ""
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        try:
+            return "header" if is_admin(decode_token(token)) else None
+        except Exception:
+            return None  # Let the route reject the bad token as usual
+
+    async def __call__(self, scope, receive, send):
+        trigger = self._trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = self.store.new_id()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = [*message.get("headers", ()), (PROFILE_ID_HEADER, profile_id.encode())]
+            await send(message)
+
+        profiler = Profiler(interval=self.interval, async_mode="enabled")
+        started = time.time()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            route = scope.get("route")
+            summary = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route.path if route is not None else None,
+                "status": status["code"],
+                "duration_ms": round((time.time() - started) * 1000, 1),
+                "trigger": trigger,
+                "created_at": started
+            }
+            try:
+                await asyncio.to_thread(self._save, profiler, profile_id, summary)
+            except Exception as e:
+                logger.warning(f"Error saving profile {profile_id}: {str(e)}")
+
+    def _save(self, profiler, profile_id, summary):
+        self.store.save(profile_id, profiler.output_html(), summary)
+        logger.info(f"Saved profile {profile_id} for {summary['method']} {summary['path']}")
+
+
+profile_store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_MAX_COUNT)
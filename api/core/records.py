@@ -0,0 +1,112 @@
+"""Normalized workout records shared by the history cache and the store"""
+from datetime import datetime
+
+UNKNOWN_DATE = "Unknown Date"
+ZONES = ("gray", "blue", "green", "orange", "red")
+WORKOUT_FIELDS = (
+    "id", "class_name", "class_type", "date", "coach", "studio",
+    "calories_burned", "splat_points", "active_time", "zone_time",
+)
+
+
+def _iso(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def combine_summaries(workouts):
+    """Flatten a performance summaries response into a single list"""
+    all_workouts = []
+    if isinstance(workouts, list):  # Check if workouts is already a list
+        for category in workouts:  # Iterate over different arrays
+            if hasattr(category, "summaries"):  # Check if summaries exist
+                all_workouts.extend(category.summaries)  # Add to master list
+    else:
+        all_workouts = workouts.summaries  # If it's just one array, use it directly
+    return all_workouts
+
+
+def workout_to_dict(workout):
+    """Normalize a performance summary into the workout record the API returns"""
+    otf_class = workout.otf_class
+    details = workout.details
+    zones = details.zone_time_minutes if details else None
+    return {
+        "id": workout.id,
+        "class_name": otf_class.name if otf_class and otf_class.name else "Unknown Class",
+        "class_type": otf_class.type if otf_class and otf_class.type else "Unknown Type",
+        "date": _iso(otf_class.starts_at_local) if otf_class and otf_class.starts_at_local else UNKNOWN_DATE,
+        "coach": otf_class.coach.first_name if otf_class and otf_class.coach else "No Coach",
+        "studio": otf_class.studio.name if otf_class and otf_class.studio else "No Studio",
+        "calories_burned": details.calories_burned if details else 0,
+        "splat_points": details.splat_points if details else 0,
+        "active_time": details.active_time_seconds if details else 0,
+        "zone_time": {zone: getattr(zones, zone) if zones else 0 for zone in ZONES}
+    }
+
+
+def sort_key(record):
+    """Sort key placing workouts without a start time last when newest first"""
+    return record["date"] if record["date"] != UNKNOWN_DATE else "1970-01-01T00:00:00"
+
+
+def order_key(record):
+    """Total order of workouts, matching the store's ``ORDER BY starts_at DESC, id DESC`` when reversed"""
+    return sort_key(record), record["id"]
+
+
+def cursor_for(record):
+    """Paging cursor pointing just past ``record``"""
+    return f"{sort_key(record)}|{record['id']}"
+
+
+def parse_cursor(cursor):
+    """``(starts_at, id)`` from a ``starts_at|id`` paging cursor.
+
+    A bare start time is accepted too and means "started before this time".
+    Raises ValueError when the start time isn't ISO 8601 or the id is empty.
+    """
+    starts_at, separator, workout_id = cursor.partition("|")
+    try:
+        datetime.fromisoformat(starts_at)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+    if separator and not workout_id:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return starts_at, workout_id
+
+
+def total_classes_to_dict(total_classes):
+    return {
+        "in_studio": total_classes.total_in_studio_classes_attended,
+        "ot_live": total_classes.total_otlive_classes_attended,
+        "total": total_classes.total_in_studio_classes_attended + total_classes.total_otlive_classes_attended
+    }
+
+
+def parse_fields(fields):
+    """Parse a comma separated ``fields=`` projection, always keeping the id.
+
+    Returns None when no projection was requested and raises ValueError on
+    unknown field names.
+    """
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in WORKOUT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown workout fields: {', '.join(unknown)}")
+    return tuple(field for field in WORKOUT_FIELDS if field == "id" or field in requested)
+
+
+def project_record(record, fields):
+    """Keep only the projected fields of a record"""
+    if fields is None:
+        return record
+    return {field: record[field] for field in fields}
+
+
+def project(records, fields):
+    """Keep only the projected fields of each record"""
+    if fields is None:
+        return records
+    return [project_record(record, fields) for record in records]
@@ -0,0 +1,178 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from api.core.config import settings
+from api.core.metrics import upstream_call_seconds, upstream_wait_seconds
+
+# Priority classes, lower runs first
+INTERACTIVE = 0
+BACKGROUND = 1
+
+_PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+_priority = ContextVar("upstream_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def upstream_priority(priority):
+    """Run upstream calls made inside the block at ``priority``.
+
+    Tasks started inside the block (including shared single-flight calls)
+    inherit it through the context.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class UpstreamScheduler:
+    """Admission control for every call to the OTF API.
+
+    A call waits for three things before it starts: a token from a bucket
+    refilled at ``rate`` per second (holding up to ``burst``), a free global
+    slot out of ``max_concurrency`` and a free slot out of the member's
+    ``member_concurrency``. Waiting calls are admitted by priority class and
+    then in arrival order, so interactive dashboard requests overtake queued
+    background syncs and prefetches. A call blocked only by its member's cap
+    doesn't hold up other members.
+    """
+
+    def __init__(self, rate, burst, max_concurrency, member_concurrency):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.member_concurrency = member_concurrency
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._active = 0
+        self._active_by_member = {}
+        self._waiters = []
+        self._order = itertools.count()
+        self._timer = None
+        self._expedited = {}  # member -> priorities of callers waiting on the member's shared calls
+
+    async def call(self, member, fn, priority=None, name="other"):
+        """Run ``fn()`` once admitted and return its result.
+
+        Queueing and call latency are recorded under the ``name`` label.
+        """
+        if priority is None:
+            priority = _priority.get()
+        if member in self._expedited:
+            priority = min(priority, *self._expedited[member])
+        queued_at = time.perf_counter()
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), member, waiter))
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Admitted just as the caller was cancelled
+                self._release(member)
+            raise
+        started = time.perf_counter()
+        priority_name = _PRIORITY_NAMES.get(priority, str(priority))
+        upstream_wait_seconds.labels(priority=priority_name).observe(started - queued_at)
+        outcome = "error"
+        try:
+            result = await fn()
+            outcome = "ok"
+            return result
+        finally:
+            upstream_call_seconds.labels(call=name, outcome=outcome).observe(time.perf_counter() - started)
+            self._release(member)
+
+    @contextmanager
+    def expedite(self, member, priority=None):
+        """Run the member's queued and new calls at least at ``priority`` inside the block.
+
+        For callers joining a call shared with others (a single flight): a
+        dashboard request that joins a prefetch's sync shouldn't wait at the
+        prefetch's background priority.
+        """
+        if priority is None:
+            priority = _priority.get()
+        self._expedited.setdefault(member, []).append(priority)
+        if any(entry[2] == member and entry[0] > priority for entry in self._waiters):
+            self._waiters = [
+                (min(entry[0], priority), *entry[1:]) if entry[2] == member else entry
+                for entry in self._waiters
+            ]
+            heapq.heapify(self._waiters)
+            self._dispatch()
+        try:
+            yield
+        finally:
+            priorities = self._expedited[member]
+            priorities.remove(priority)
+            if not priorities:
+                del self._expedited[member]
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _dispatch(self):
+        self._refill()
+        blocked = []
+        while self._waiters and self._active < self.max_concurrency and self._tokens >= 1:
+            entry = heapq.heappop(self._waiters)
+            _, _, member, waiter = entry
+            if waiter.done():
+                continue
+            if self._active_by_member.get(member, 0) >= self.member_concurrency:
+                blocked.append(entry)
+                continue
+            self._tokens -= 1
+            self._active += 1
+            self._active_by_member[member] = self._active_by_member.get(member, 0) + 1
+            waiter.set_result(None)
+        for entry in blocked:
+            heapq.heappush(self._waiters, entry)
+
+        if self._waiters and self._tokens < 1 and self._timer is None:
+            # Wake up when the next token is due
+            delay = (1 - self._tokens) / self.rate
+            self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+    def _release(self, member):
+        self._active -= 1
+        remaining = self._active_by_member[member] - 1
+        if remaining:
+            self._active_by_member[member] = remaining
+        else:
+            del self._active_by_member[member]
+        self._dispatch()
+
+
+def _per_worker(total):
+    """This worker's share of a host-wide limit"""
+    return max(1, total // settings.WORKERS) if isinstance(total, int) else total / settings.WORKERS
+
+
+upstream_scheduler = UpstreamScheduler(
+    rate=_per_worker(settings.UPSTREAM_RATE_PER_SECOND),
+    burst=_per_worker(settings.UPSTREAM_BURST),
+    max_concurrency=_per_worker(settings.UPSTREAM_MAX_CONCURRENCY),
+    member_concurrency=settings.UPSTREAM_MEMBER_CONCURRENCY
+)
+
+# Logins run on their own budget, so a burst of (possibly bogus) login
+# attempts can't use up the tokens members' dashboard calls need
+login_scheduler = UpstreamScheduler(
+    rate=_per_worker(settings.UPSTREAM_LOGIN_RATE_PER_SECOND),
+    burst=_per_worker(settings.UPSTREAM_LOGIN_BURST),
+    max_concurrency=_per_worker(settings.UPSTREAM_LOGIN_MAX_CONCURRENCY),
+    member_concurrency=settings.UPSTREAM_MEMBER_CONCURRENCY
+)
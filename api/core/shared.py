@@ -0,0 +1,112 @@
+import sqlite3
+import threading
+import time
+import orjson
+from api.core.config import settings, logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS generations (
+    member TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL
+);
+"""
+
+# Expired entries are swept after this many writes
+_PRUNE_EVERY = 256
+
+
+class SharedCache:
+    """Cache shared by every uvicorn worker on the host through a local SQLite file.
+
+    Values are stored as orjson blobs and read through SQLite's memory-mapped
+    I/O, so a hit from any worker costs a page lookup rather than an upstream
+    call. Each member also has a generation counter: a worker that changes a
+    member's data bumps it, and the other workers drop their in-process copies
+    when they see a newer generation.
+
+    Methods are blocking; call them through ``asyncio.to_thread`` from async
+    code.
+    """
+
+    def __init__(self, path, mmap_size):
+        self.path = path
+        self.mmap_size = mmap_size
+        self._lock = threading.Lock()
+        self._conn = None
+        self._writes = 0
+
+    def _connection(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            logger.info(f"Opened shared cache: {self.path}")
+        return self._conn
+
+    def get(self, namespace, key):
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return orjson.loads(value)
+
+    def set(self, namespace, key, value, ttl=None):
+        """Store ``value`` for every worker, optionally expiring after ``ttl`` seconds"""
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (namespace, key, orjson.dumps(value), expires_at)
+                )
+                self._writes += 1
+                if self._writes % _PRUNE_EVERY == 0:
+                    conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+
+    def generation(self, member):
+        """Current generation of the member's data, 0 if it never changed"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT generation FROM generations WHERE member = ?", (member,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, member):
+        """Mark the member's data as changed for all workers and return the new generation"""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT INTO generations (member, generation) VALUES (?, 1) "
+                    "ON CONFLICT (member) DO UPDATE SET generation = generation + 1",
+                    (member,)
+                )
+                return conn.execute(
+                    "SELECT generation FROM generations WHERE member = ?", (member,)
+                ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+shared_cache = SharedCache(settings.SHARED_CACHE_PATH, settings.SHARED_CACHE_MMAP_BYTES)
@@ -0,0 +1,32 @@
+import asyncio
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    The first caller starts ``fn()``; callers arriving while it runs await
+    the same task and get its result or exception. The key is released as
+    soon as the call finishes, so later callers start a fresh one.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    def __len__(self):
+        return len(self._calls)
+
+    async def do(self, key, fn):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        # Shield so one caller disconnecting doesn't cancel everyone's call
+        return await asyncio.shield(task)
+
+    def _release(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+
+upstream_flights = SingleFlight()
@@ -0,0 +1,284 @@
+import sqlite3
+import threading
+from datetime import date, timedelta
+from api.core.config import settings, logger
+from api.core.records import ZONES, sort_key
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workouts (
+    member TEXT NOT NULL,
+    id TEXT NOT NULL,
+    starts_at TEXT NOT NULL,
+    date TEXT NOT NULL,
+    class_name TEXT,
+    class_type TEXT,
+    coach TEXT,
+    studio TEXT,
+    calories_burned INTEGER,
+    splat_points INTEGER,
+    active_time INTEGER,
+    zone_gray INTEGER,
+    zone_blue INTEGER,
+    zone_green INTEGER,
+    zone_orange INTEGER,
+    zone_red INTEGER,
+    PRIMARY KEY (member, id)
+);
+CREATE INDEX IF NOT EXISTS idx_workouts_member_starts_at ON workouts (member, starts_at DESC);
+CREATE TABLE IF NOT EXISTS members (
+    member TEXT PRIMARY KEY,
+    in_studio INTEGER NOT NULL,
+    ot_live INTEGER NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rollups (
+    member TEXT NOT NULL,
+    period TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    workouts INTEGER NOT NULL,
+    calories_burned INTEGER NOT NULL,
+    splat_points INTEGER NOT NULL,
+    active_time INTEGER NOT NULL,
+    zone_gray INTEGER NOT NULL,
+    zone_blue INTEGER NOT NULL,
+    zone_green INTEGER NOT NULL,
+    zone_orange INTEGER NOT NULL,
+    zone_red INTEGER NOT NULL,
+    PRIMARY KEY (member, period, bucket)
+);
+"""
+
+_COLUMNS = (
+    "id", "starts_at", "date", "class_name", "class_type", "coach", "studio",
+    "calories_burned", "splat_points", "active_time",
+) + tuple(f"zone_{zone}" for zone in ZONES)
+
+_SELECT_WORKOUTS = f"SELECT {', '.join(_COLUMNS)} FROM workouts WHERE member = ? ORDER BY starts_at DESC, id DESC"
+
+ROLLUP_PERIODS = ("weekly", "monthly")
+_ROLLUP_SUMS = ("calories_burned", "splat_points", "active_time") + tuple(f"zone_{zone}" for zone in ZONES)
+
+# Bucket label per period: the week's Sunday (matching the dashboard) or the month
+_BUCKETS = {
+    "weekly": "date(substr(starts_at, 1, 10), '-' || strftime('%w', substr(starts_at, 1, 10)) || ' days')",
+    "monthly": "substr(starts_at, 1, 7)",
+}
+
+
+def _bucket_bounds(period, day):
+    """First day of the bucket holding ``day`` and first day of the next one"""
+    if period == "weekly":
+        start = day - timedelta(days=day.isoweekday() % 7)
+        return start, start + timedelta(days=7)
+    start = day.replace(day=1)
+    return start, (start + timedelta(days=32)).replace(day=1)
+
+
+def _bucket_label(period, day):
+    return day.isoformat() if period == "weekly" else day.isoformat()[:7]
+
+
+def _to_row(member, record):
+    return (
+        member, record["id"], sort_key(record), record["date"], record["class_name"], record["class_type"],
+        record["coach"], record["studio"], record["calories_burned"], record["splat_points"],
+        record["active_time"], *(record["zone_time"][zone] for zone in ZONES)
+    )
+
+
+def _from_row(row):
+    return {
+        "id": row[0],
+        "class_name": row[3],
+        "class_type": row[4],
+        "date": row[2],
+        "coach": row[5],
+        "studio": row[6],
+        "calories_burned": row[7],
+        "splat_points": row[8],
+        "active_time": row[9],
+        "zone_time": dict(zip(ZONES, row[10:15]))
+    }
+
+
+class WorkoutStore:
+    """SQLite store of normalized workout records, shared by all workers.
+
+    Methods are blocking; call them through ``asyncio.to_thread`` from async
+    code.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            # WAL lets other uvicorn workers read while one of them syncs
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._backfill_rollups(conn)
+            self._conn = conn
+            logger.info(f"Opened workout store: {self.path}")
+        return self._conn
+
+    def _backfill_rollups(self, conn):
+        """Build rollups for members synced before rollups were materialized"""
+        members = [member for (member,) in conn.execute(
+            "SELECT member FROM members WHERE member NOT IN (SELECT DISTINCT member FROM rollups)"
+        )]
+        if members:
+            with conn:
+                for member in members:
+                    for period in ROLLUP_PERIODS:
+                        self._refresh_rollups(conn, member, period)
+            logger.info(f"Built workout rollups for {len(members)} members")
+
+    def load(self, member):
+        """Return ``(workouts, total_classes, synced_at)`` or None if never synced"""
+        with self._lock:
+            conn = self._connection()
+            state = conn.execute(
+                "SELECT in_studio, ot_live, synced_at FROM members WHERE member = ?", (member,)
+            ).fetchone()
+            if state is None:
+                return None
+            workouts = [_from_row(row) for row in conn.execute(_SELECT_WORKOUTS, (member,))]
+        in_studio, ot_live, synced_at = state
+        total_classes = {"in_studio": in_studio, "ot_live": ot_live, "total": in_studio + ot_live}
+        return workouts, total_classes, synced_at
+
+    def save(self, member, records, total_classes, synced_at, replace=False):
+        """Upsert workout records and the member's totals and refresh their rollups.
+
+        With ``replace`` the member's existing rows are dropped first, so a
+        full fetch also removes workouts that disappeared upstream, and all of
+        the member's rollups are rebuilt. Otherwise only the buckets holding
+        the saved records (or the rows they replace) are recomputed.
+        """
+        rows = [_to_row(member, record) for record in records]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                if replace:
+                    conn.execute("DELETE FROM workouts WHERE member = ?", (member,))
+                    days = None
+                else:
+                    days = self._affected_days(conn, member, rows)
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO workouts (member, {', '.join(_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * (len(_COLUMNS) + 1))})",
+                    rows
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO members (member, in_studio, ot_live, synced_at) VALUES (?, ?, ?, ?)",
+                    (member, total_classes["in_studio"], total_classes["ot_live"], synced_at)
+                )
+                for period in ROLLUP_PERIODS:
+                    self._refresh_rollups(conn, member, period, days)
+
+    @staticmethod
+    def _affected_days(conn, member, rows):
+        """Dates of the rows being saved and of the stored rows they replace"""
+        starts = {row[2] for row in rows}
+        ids = [row[1] for row in rows]
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            starts.update(starts_at for (starts_at,) in conn.execute(
+                f"SELECT starts_at FROM workouts WHERE member = ? AND id IN ({', '.join('?' * len(chunk))})",
+                [member, *chunk]
+            ))
+        return {date.fromisoformat(starts_at[:10]) for starts_at in starts if starts_at[:4] != "1970"}
+
+    @staticmethod
+    def _refresh_rollups(conn, member, period, days=None):
+        """Recompute the member's buckets spanning ``days``, or all of them when None"""
+        bucket = _BUCKETS[period]
+        where = "member = ? AND starts_at >= '1971'"  # Skip workouts without a start time
+        params = [member]
+        if days is None:
+            conn.execute("DELETE FROM rollups WHERE member = ? AND period = ?", (member, period))
+        elif not days:
+            return
+        else:
+            lo, _ = _bucket_bounds(period, min(days))
+            _, hi = _bucket_bounds(period, max(days))
+            conn.execute(
+                "DELETE FROM rollups WHERE member = ? AND period = ? AND bucket >= ? AND bucket < ?",
+                (member, period, _bucket_label(period, lo), _bucket_label(period, hi))
+            )
+            # Whole buckets only, so partially covered ones are never summed short
+            where += " AND starts_at >= ? AND starts_at < ?"
+            params += [lo.isoformat(), hi.isoformat()]
+        conn.execute(
+            f"INSERT INTO rollups (member, period, bucket, workouts, {', '.join(_ROLLUP_SUMS)}) "
+            f"SELECT member, ?, {bucket} AS bucket, COUNT(*), "
+            f"{', '.join(f'COALESCE(SUM({column}), 0)' for column in _ROLLUP_SUMS)} "
+            f"FROM workouts WHERE {where} GROUP BY bucket",
+            [period, *params]
+        )
+
+    def rollups(self, member, period):
+        """The member's materialized ``period`` rollups, oldest bucket first"""
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT bucket, workouts, {', '.join(_ROLLUP_SUMS)} FROM rollups "
+                "WHERE member = ? AND period = ? ORDER BY bucket",
+                (member, period)
+            ).fetchall()
+        return [
+            {
+                "bucket": row[0],
+                "workouts": row[1],
+                "calories_burned": row[2],
+                "splat_points": row[3],
+                "active_time": row[4],
+                "zone_time": dict(zip(ZONES, row[5:10]))
+            }
+            for row in rows
+        ]
+
+    def iter_workouts(self, member, before=None, limit=None, batch_size=500):
+        """Yield the member's workout records newest first straight off the index.
+
+        ``before`` is a parsed ``(starts_at, id)`` paging cursor.
+
+        Uses its own read-only connection so a long stream never holds the
+        store lock, and fetches rows in batches so memory stays flat. The
+        connection may be used from any thread, since ``StreamingResponse``
+        advances the generator on whichever threadpool thread is free.
+        """
+        query = f"SELECT {', '.join(_COLUMNS)} FROM workouts WHERE member = ?"
+        params = [member]
+        if before is not None:
+            starts_at, workout_id = before
+            query += " AND (starts_at < ? OR (starts_at = ? AND id < ?))"
+            params.extend((starts_at, starts_at, workout_id))
+        query += " ORDER BY starts_at DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False, timeout=30)
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield _from_row(row)
+        finally:
+            conn.close()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+workout_store = WorkoutStore(settings.WORKOUT_DB_PATH)
@@ -0,0 +1,88 @@
+import numpy as np
+from api.core.analytics import WEEKDAYS, longest_run
+
+
+def _avg(total, count):
+    return round(float(total) / int(count), 1) if count else 0
+
+
+def _bucket_series(days, calories, splats):
+    """Average calories and splats per bucket, oldest bucket first"""
+    if not len(days):
+        return []
+    buckets, inverse = np.unique(days, return_inverse=True)
+    counts = np.bincount(inverse)
+    avg_calories = np.round(np.bincount(inverse, weights=calories) / counts, 1)
+    avg_splats = np.round(np.bincount(inverse, weights=splats) / counts, 1)
+    return [
+        {"date": label, "avg_calories": calories, "avg_splats": splats, "count": count}
+        for label, calories, splats, count in zip(
+            buckets.astype(str).tolist(), avg_calories.tolist(), avg_splats.tolist(), counts.tolist()
+        )
+    ]
+
+
+def _streaks(days, calories):
+    """Consecutive-day and consecutive-HRM streaks over workouts oldest first"""
+    if not len(days):
+        return {"current_streak": 0, "longest_streak": 0, "hrm_streak": 0}
+    # A streak is a run of workouts each one day after the previous one
+    consecutive = np.diff(days.astype(np.int64)) == 1
+    longest, trailing = longest_run(consecutive)
+    hrm_longest, _ = longest_run(calories > 0)
+    return {
+        "current_streak": trailing + 1,
+        "longest_streak": longest + 1,
+        "hrm_streak": hrm_longest
+    }
+
+
+def compute_trends(columns):
+    """Aggregate a member's workout columns for the Trends tab.
+
+    Returns totals, averages, personal records, the best weekday by average
+    calories, per-class averages, streaks, daily/weekly/monthly series and a
+    metric summary with zone-time shares.
+    """
+    total_workouts = len(columns)
+    calories = columns.column("calories_burned")
+    splats = columns.column("splat_points")
+
+    weekday_counts, weekday_means = columns.group_means(columns.weekdays, len(WEEKDAYS), "calories_burned")
+    best_day = WEEKDAYS[int(np.argmax(weekday_means))] if weekday_counts.any() else "Unknown"
+
+    class_counts = np.bincount(columns.class_codes, minlength=len(columns.class_names))
+    class_calories = np.bincount(columns.class_codes, weights=calories, minlength=len(columns.class_names))
+    class_splats = np.bincount(columns.class_codes, weights=splats, minlength=len(columns.class_names))
+
+    dated = ~np.isnat(columns.days)
+    order = np.argsort(columns.days[dated], kind="stable")
+    days = columns.days[dated][order]
+    dated_calories = calories[dated][order]
+    dated_splats = splats[dated][order]
+    # Weeks start on Sunday, matching the dashboard's calendar
+    sundays = days - ((days.astype(np.int64) + 4) % 7).astype("timedelta64[D]")
+
+    return {
+        "total_workouts": total_workouts,
+        "avg_calories": _avg(calories.sum(), total_workouts),
+        "avg_splats": _avg(splats.sum(), total_workouts),
+        "best_day": best_day,
+        "highest_calories": int(calories.max()) if total_workouts else 0,
+        "highest_splats": int(splats.max()) if total_workouts else 0,
+        "class_performance": {
+            class_name: {
+                "avg_calories": _avg(class_calories[i], class_counts[i]),
+                "avg_splats": _avg(class_splats[i], class_counts[i]),
+                "count": int(class_counts[i])
+            }
+            for i, class_name in enumerate(columns.class_names)
+        },
+        **_streaks(days, dated_calories),
+        "series": {
+            "daily": _bucket_series(days, dated_calories, dated_splats),
+            "weekly": _bucket_series(sundays, dated_calories, dated_splats),
+            "monthly": _bucket_series(days.astype("datetime64[M]"), dated_calories, dated_splats)
+        },
+        "summary": columns.summary()
+    }
@@ -1,14 +1,22 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from api.core.charts import chart_renderer
 from api.core.config import settings
-from api.routers import auth, members, workouts
+from api.core.metrics import MetricsMiddleware, render_metrics
+from api.core.pool import client_pool
+from api.core.profiling import ProfilingMiddleware, profile_store
+from api.core.shared import shared_cache
+from api.core.store import workout_store
+from api.routers import admin, auth, charts, members, trends, workouts
 
 app = FastAPI(
     title=settings.API_TITLE,
     description=settings.API_DESCRIPTION,
     version=settings.API_VERSION,
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -20,10 +28,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in profiling of sampled requests or admin requests sending X-Profile: 1
+app.add_middleware(
+    ProfilingMiddleware,
+    store=profile_store,
+    sample_rate=settings.PROFILE_SAMPLE_RATE,
+    interval=settings.PROFILE_INTERVAL_SECONDS
+)
+
+# Per-route latency and response size, exposed on /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api", tags=["Authentication"])
 app.include_router(workouts.router, prefix="/api", tags=["Workouts"])
 app.include_router(members.router, prefix="/api", tags=["Members"])
+app.include_router(trends.router, prefix="/api", tags=["Trends"])
+app.include_router(charts.router, prefix="/api", tags=["Charts"])
+app.include_router(admin.router, prefix="/api", tags=["Admin"])
+
+@app.on_event("shutdown")
+async def close_otf_clients():
+    """Close pooled OTF client sessions, the stores and the chart render pool"""
+    await client_pool.close()
+    workout_store.close()
+    shared_cache.close()
+    chart_renderer.close()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics"""
+    body, content_type = render_metrics()
+    return Response(body, headers={"Content-Type": content_type})
 
 @app.get("/health", tags=["System"])
 async def health_check():
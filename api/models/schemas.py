@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
+from typing import List, Optional
 
 # Auth Models
 class LoginRequest(BaseModel):
@@ -73,3 +74,70 @@ class MemberDetailResponse(BaseModel):
                 }
             }
         }
+
+# Workout Models
+class ZoneTime(BaseModel):
+    gray: int
+    blue: int
+    green: int
+    orange: int
+    red: int
+
+class Workout(BaseModel):
+    id: str
+    class_name: str
+    class_type: str
+    date: str
+    coach: str
+    studio: str
+    calories_burned: int
+    splat_points: int
+    active_time: int
+    zone_time: ZoneTime
+
+class PerformanceData(BaseModel):
+    retrieved_workouts: int
+    workouts: List[Workout]
+    next_cursor: Optional[str] = None
+
+class TotalClasses(BaseModel):
+    in_studio: int
+    ot_live: int
+    total: int
+
+class DateRange(BaseModel):
+    first_class: str
+    last_class: str
+
+class TotalClassesResponse(BaseModel):
+    performance_data: PerformanceData
+    total_classes: TotalClasses
+    date_range: DateRange
+    status: str
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "performance_data": {
+                    "retrieved_workouts": 1,
+                    "workouts": [
+                        {
+                            "id": "a1b2c3",
+                            "class_name": "Orange 60",
+                            "class_type": "ORANGE_60",
+                            "date": "2023-06-30T06:00:00",
+                            "coach": "Sam",
+                            "studio": "Downtown",
+                            "calories_burned": 612,
+                            "splat_points": 18,
+                            "active_time": 3540,
+                            "zone_time": {"gray": 2, "blue": 6, "green": 24, "orange": 15, "red": 3}
+                        }
+                    ],
+                    "next_cursor": None
+                },
+                "total_classes": {"in_studio": 120, "ot_live": 4, "total": 124},
+                "date_range": {"first_class": "2023-06-30T06:00:00", "last_class": "2023-06-30T06:00:00"},
+                "status": "success"
+            }
+        }
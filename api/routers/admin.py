@@ -0,0 +1,21 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from api.core.auth import require_admin
+from api.core.profiling import profile_store
+
+router = APIRouter()
+
+@router.get("/admin/profiles")
+async def list_profiles(admin: dict = Depends(require_admin)):
+    """List captured request profiles, newest first"""
+    profiles = await asyncio.to_thread(profile_store.list)
+    return {"profiles": profiles, "status": "success"}
+
+@router.get("/admin/profiles/{profile_id}")
+async def get_profile(profile_id: str, admin: dict = Depends(require_admin)):
+    """Download one profile as a pyinstrument HTML report"""
+    path = profile_store.report_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/html", filename=f"{profile_id}.html")
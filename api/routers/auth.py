@@ -1,29 +1,41 @@
-from fastapi import APIRouter, HTTPException, status
-from api.core.config import logger
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status
+from api.core.config import settings, logger
 from api.core.auth import create_access_token
+from api.core.pool import client_pool, member_key
+from api.core.prefetch import prefetch_member_data
+from api.core.scheduler import login_scheduler
 from api.models.schemas import LoginRequest
-from otf_api import Otf
 
 router = APIRouter()
 
 @router.post("/login")
-async def login(request: LoginRequest):
-    """Authenticate user and return access token"""
+async def login(request: LoginRequest, background_tasks: BackgroundTasks):
+    """Authenticate user and return access token.
+
+    After the response is sent, the member's dashboard data is prefetched
+    into the server caches so the first dashboard load hits warm data.
+    """
+    credentials = {
+        "email": request.email,
+        "password": request.password
+    }
     otf = None
     try:
         logger.info(f"Login attempt for email: {request.email}")
-        otf = Otf(request.email, request.password)
-        
-        # Verify credentials
-        await otf.get_performance_summaries(limit=1)
+        # The verified client stays pooled for the member's dashboard requests
+        async with client_pool.lease(credentials) as otf:
+            # Verify credentials
+            await login_scheduler.call(
+                member_key(credentials), lambda: otf.get_performance_summaries(limit=1), name="login_check"
+            )
         
         token_data = {
             "sub": request.email,
-            "credentials": {
-                "email": request.email,
-                "password": request.password
-            }
+            "credentials": credentials
         }
+
+        if settings.PREFETCH_ON_LOGIN:
+            background_tasks.add_task(prefetch_member_data, credentials)
         
         return {
             "access_token": create_access_token(token_data),
@@ -32,7 +44,7 @@ async def login(request: LoginRequest):
         }
     except Exception as e:
         logger.error(f"Login failed: {str(e)}")
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-    finally:
-        if otf and hasattr(otf, 'session') and otf.session:
-            await otf.session.close()
\ No newline at end of file
+        if otf:
+            # Only the client this attempt used; another session for the member stays
+            await client_pool.discard(credentials, otf)
+        raise HTTPException(status_code=401, detail="Invalid credentials")
\ No newline at end of file
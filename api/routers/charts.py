@@ -0,0 +1,33 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, Request, Response
+from api.core.auth import oauth2_scheme, member_client
+from api.core.charts import CHART_VERSION, MEDIA_TYPES, chart_data, chart_renderer
+from api.core.etag import CACHE_CONTROL, content_etag, is_not_modified, not_modified
+from api.core.history import history_cache
+
+router = APIRouter()
+
+@router.get("/charts/{name}")
+async def get_chart(
+    request: Request,
+    name: Literal["yearly_overview", "performance_dashboard", "day_of_week", "studio_visits"],
+    format: Literal["png", "svg"] = "png",
+    refresh: bool = False,
+    token: str = Depends(oauth2_scheme)
+):
+    """Render one of the analysis charts as a PNG or SVG image.
+
+    Charts are drawn from the member's cached history on a worker process
+    pool, so matplotlib never blocks the event loop. Rendered images are
+    cached until the history changes, and conditional requests get a 304.
+    """
+    async with member_client(token) as (member, otf):
+        history = await history_cache.get(member, otf, refresh=refresh)
+
+        etag = content_etag(history.content_hash, "chart", name, format, CHART_VERSION)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if is_not_modified(request, etag):
+            return not_modified(etag, headers)
+
+        image = await chart_renderer.render(etag, name, lambda: chart_data(name, history), format)
+        return Response(image, media_type=MEDIA_TYPES[format], headers=headers)
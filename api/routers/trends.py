@@ -0,0 +1,46 @@
+import asyncio
+from typing import Literal
+from fastapi import APIRouter, Depends, Request
+from api.core.auth import oauth2_scheme, member_client
+from api.core.encoding import negotiated_response
+from api.core.history import history_cache
+from api.core.store import workout_store
+
+router = APIRouter()
+
+@router.get("/trends")
+async def get_trends(request: Request, refresh: bool = False, token: str = Depends(oauth2_scheme)):
+    """Get workout trend aggregates and daily/weekly/monthly series.
+
+    Computed once per history sync and shared by all workers through the
+    shared cache. Conditional requests get a 304 while the history is unchanged.
+    """
+    async with member_client(token) as (member, otf):
+        history = await history_cache.get(member, otf, refresh=refresh)
+        trends = await history_cache.trends(member, history)
+
+        return negotiated_response(request, (history.content_hash, "trends"), lambda media_type: {
+            "data": trends,
+            "status": "success"
+        })
+
+@router.get("/rollups")
+async def get_rollups(
+    request: Request,
+    period: Literal["weekly", "monthly"] = "weekly",
+    refresh: bool = False,
+    token: str = Depends(oauth2_scheme)
+):
+    """Get weekly or monthly totals of calories, splat points, active time and zone minutes.
+
+    Rollups are materialized in the workout store and only the buckets
+    touched by a sync are recomputed, so this reads one row per bucket
+    instead of re-bucketing the whole history.
+    """
+    async with member_client(token) as (member, otf):
+        history = await history_cache.get(member, otf, refresh=refresh)
+        rollups = await asyncio.to_thread(workout_store.rollups, member, period)
+        return negotiated_response(request, (history.content_hash, "rollups", period), lambda media_type: {
+            "data": {"period": period, "buckets": rollups},
+            "status": "success"
+        })
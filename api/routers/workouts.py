@@ -1,82 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException
-from api.core.config import logger
-from api.core.auth import oauth2_scheme, decode_token, get_otf_client
-import asyncio
+import orjson
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from api.core.auth import oauth2_scheme, member_client
+from api.core.encoding import MSGPACK_MEDIA_TYPE, NDJSON_MEDIA_TYPE, encode_columns, negotiate_media_type, negotiated_response
+from api.core.history import history_cache
+from api.core.records import WORKOUT_FIELDS, parse_cursor, parse_fields, project, project_record
+from api.core.store import workout_store
+from api.models.schemas import TotalClassesResponse
 
 router = APIRouter()
 
-@router.get("/total-classes")
-async def get_total_classes(token: str = Depends(oauth2_scheme)):
-    """Get total class counts and detailed HRM workout history, sorted by most recent"""
-    otf = None
+def _ndjson_lines(records, fields):
+    """Encode records as newline delimited JSON, one workout per line"""
+    for record in records:
+        yield orjson.dumps(project_record(record, fields)) + b"\n"
+
+@router.get("/total-classes", response_model=TotalClassesResponse)
+async def get_total_classes(
+    request: Request,
+    refresh: bool = False,
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of workouts to return"),
+    before: Optional[str] = Query(None, description="Cursor from next_cursor: only return workouts after it"),
+    fields: Optional[str] = Query(None, description="Comma separated workout fields to include, e.g. date,class_name"),
+    token: str = Depends(oauth2_scheme)
+):
+    """Get total class counts and detailed HRM workout history, sorted by most recent.
+
+    History is served from the member's server-side cache and synced
+    incrementally; pass ``refresh=true`` to sync new workouts now. Use
+    ``limit``/``before`` to page through workouts (follow ``next_cursor``)
+    and ``fields`` to trim each workout. Totals and the date range always
+    describe the whole history.
+
+    Responses carry an ETag; send it back in ``If-None-Match`` to get an
+    empty 304 while the history is unchanged. ``Accept: application/msgpack``
+    returns MessagePack with the workouts as dictionary-encoded columns, and
+    large bodies are brotli or gzip compressed per ``Accept-Encoding``.
+
+    Send ``Accept: application/x-ndjson`` to stream just the workouts, one
+    JSON object per line, straight from the workout store's start-time index.
+    """
     try:
-        credentials = decode_token(token)
-        otf = await get_otf_client(credentials)
+        projection = parse_fields(fields)
+        cursor = parse_cursor(before) if before is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        # Fetch all workouts with a high limit
-        workouts, total_classes = await asyncio.gather(
-            otf.get_performance_summaries(limit=5000),  # Ensure all workouts are retrieved
-            otf.get_total_classes()
-        )
+    async with member_client(token) as (member, otf):
+        history = await history_cache.get(member, otf, refresh=refresh)
 
-        # Ensure workouts are combined (if multiple arrays exist)
-        all_workouts = []
-        if isinstance(workouts, list):  # Check if workouts is already a list
-            for category in workouts:  # Iterate over different arrays
-                if hasattr(category, "summaries"):  # Check if summaries exist
-                    all_workouts.extend(category.summaries)  # Add to master list
-        else:
-            all_workouts = workouts.summaries  # If it's just one array, use it directly
+        if negotiate_media_type(request, offers=(NDJSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE)) == NDJSON_MEDIA_TYPE:
+            if history.persisted:
+                records = workout_store.iter_workouts(member, before=cursor, limit=limit)
+            else:
+                # The last write to the store failed, so it may be missing workouts
+                records, _ = history.page(before=cursor, limit=limit)
+            return StreamingResponse(_ndjson_lines(records, projection), media_type=NDJSON_MEDIA_TYPE)
 
-        # Sort workouts by date (most recent first)
-        sorted_workouts = sorted(
-            all_workouts, 
-            key=lambda workout: workout.otf_class.starts_at_local if workout.otf_class else "1970-01-01T00:00:00",
-            reverse=True
-        )
+        workouts, next_cursor = history.page(before=cursor, limit=limit)
 
-        # Extract HRM workout details safely
-        workout_details = []
-        for workout in sorted_workouts:
-            workout_details.append({
-                "id": workout.id,
-                "class_name": workout.otf_class.name if workout.otf_class and workout.otf_class.name else "Unknown Class",
-                "class_type": workout.otf_class.type if workout.otf_class and workout.otf_class.type else "Unknown Type",
-                "date": workout.otf_class.starts_at_local if workout.otf_class and workout.otf_class.starts_at_local else "Unknown Date",
-                "coach": workout.otf_class.coach.first_name if workout.otf_class and workout.otf_class.coach else "No Coach",
-                "studio": workout.otf_class.studio.name if workout.otf_class and workout.otf_class.studio else "No Studio",
-                "calories_burned": workout.details.calories_burned if workout.details else 0,
-                "splat_points": workout.details.splat_points if workout.details else 0,
-                "active_time": workout.details.active_time_seconds if workout.details else 0,
-                "zone_time": {
-                    "gray": workout.details.zone_time_minutes.gray if workout.details and workout.details.zone_time_minutes else 0,
-                    "blue": workout.details.zone_time_minutes.blue if workout.details and workout.details.zone_time_minutes else 0,
-                    "green": workout.details.zone_time_minutes.green if workout.details and workout.details.zone_time_minutes else 0,
-                    "orange": workout.details.zone_time_minutes.orange if workout.details and workout.details.zone_time_minutes else 0,
-                    "red": workout.details.zone_time_minutes.red if workout.details and workout.details.zone_time_minutes else 0,
-                }
-            })
+        def build_content(media_type):
+            if media_type == MSGPACK_MEDIA_TYPE:
+                workout_data = encode_columns(workouts, projection or WORKOUT_FIELDS)
+            else:
+                workout_data = project(workouts, projection)  # Sorted HRM workout history
+            return {
+                "performance_data": {
+                    "retrieved_workouts": len(history.workouts),
+                    "workouts": workout_data,
+                    "next_cursor": next_cursor
+                },
+                "total_classes": history.total_classes,
+                "date_range": history.date_range,
+                "status": "success"
+            }
 
-        return {
-            "performance_data": {
-                "retrieved_workouts": len(workout_details),
-                "workouts": workout_details  # Sorted HRM workout history
-            },
-            "total_classes": {
-                "in_studio": total_classes.total_in_studio_classes_attended,
-                "ot_live": total_classes.total_otlive_classes_attended,
-                "total": total_classes.total_in_studio_classes_attended + total_classes.total_otlive_classes_attended
-            },
-            "date_range": {
-                "first_class": sorted_workouts[-1].otf_class.starts_at_local if sorted_workouts else "Unknown",
-                "last_class": sorted_workouts[0].otf_class.starts_at_local if sorted_workouts else "Unknown"
-            },
-            "status": "success"
-        }
-        
-    except Exception as e:
-        logger.error(f"Error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if otf and hasattr(otf, 'session') and otf.session:
-            await otf.session.close()
+        return negotiated_response(request, (history.content_hash, request.url.query), build_content)
@@ -0,0 +1,178 @@
+"""Simulated OTF upstream for load tests.
+
+``FakeOtf`` stands in for ``otf_api.Otf`` with configurable login and call
+latency, error rates and history size, overridable per member, so the API
+can be driven hard without touching the real service. Install it with
+``install()``, or serve the app on top of it with
+``python -m benchmarks.fake_otf --port 8000``.
+"""
+import argparse
+import asyncio
+import random
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import SimpleNamespace
+from benchmarks.synthetic import make_summaries
+
+
+@dataclass
+class FakeUpstream:
+    """Behaviour shared by every ``FakeOtf`` client.
+
+    ``members`` maps an email to overrides of ``latency``, ``error_rate``,
+    ``login_latency`` or ``login_error_rate`` for that member only.
+    """
+    latency: float = 0.15           # Mean seconds per upstream call
+    jitter: float = 0.5             # Latency varies by +/- this fraction
+    error_rate: float = 0.0         # Chance that any call raises
+    login_latency: float = 0.3      # Mean seconds per login
+    login_error_rate: float = 0.0   # Chance that a login raises
+    history_sizes: list = field(default_factory=lambda: [250])  # Picked per member by email hash
+    members: dict = field(default_factory=dict)
+    calls: int = 0
+    errors: int = 0
+    logins: int = 0
+    login_errors: int = 0
+
+    def setting(self, email, name):
+        return self.members.get(email, {}).get(name, getattr(self, name))
+
+    def delay(self, email, name):
+        """A jittered ``name`` latency for ``email``"""
+        return max(0.0, random.uniform(1 - self.jitter, 1 + self.jitter) * self.setting(email, name))
+
+    def history_size(self, email):
+        return self.history_sizes[zlib.crc32(email.encode()) % len(self.history_sizes)]
+
+
+upstream = FakeUpstream()
+
+
+class SimulatedUpstreamError(Exception):
+    pass
+
+
+class _Session:
+    async def close(self):
+        pass
+
+
+class FakeOtf:
+    """Drop-in for the ``otf_api.Otf`` methods the API calls.
+
+    Like ``otf_api.Otf``, the constructor logs in synchronously, so it blocks
+    the calling thread for the login latency and may raise.
+    """
+
+    def __init__(self, email, password):
+        self.email = email
+        self.session = _Session()
+        self._summaries = None
+        upstream.logins += 1
+        time.sleep(upstream.delay(email, "login_latency"))
+        if random.random() < upstream.setting(email, "login_error_rate"):
+            upstream.login_errors += 1
+            raise SimulatedUpstreamError("Simulated login failure")
+
+    async def _call(self):
+        upstream.calls += 1
+        await asyncio.sleep(upstream.delay(self.email, "latency"))
+        if random.random() < upstream.setting(self.email, "error_rate"):
+            upstream.errors += 1
+            raise SimulatedUpstreamError("Simulated upstream failure")
+
+    @property
+    def summaries(self):
+        if self._summaries is None:
+            seed = zlib.crc32(self.email.encode())
+            self._summaries = make_summaries(upstream.history_size(self.email), seed=seed)
+        return self._summaries
+
+    async def get_performance_summaries(self, limit=None):
+        await self._call()
+        return SimpleNamespace(summaries=self.summaries[:limit])
+
+    async def get_total_classes(self):
+        await self._call()
+        return SimpleNamespace(total_in_studio_classes_attended=len(self.summaries), total_otlive_classes_attended=0)
+
+    async def get_member_detail(self):
+        await self._call()
+        dates = [datetime.fromisoformat(s.otf_class.starts_at_local) for s in self.summaries] or [datetime(2015, 1, 1)]
+        return SimpleNamespace(
+            first_name="Load",
+            last_name="Test",
+            email=self.email,
+            max_hr=190,
+            member_class_summary=SimpleNamespace(
+                total_classes_booked=len(self.summaries) + 10,
+                total_classes_attended=len(self.summaries),
+                total_classes_used_hrm=len(self.summaries),
+                first_visit_date=min(dates),
+                last_class_visited_date=max(dates),
+                total_studios_visited=len({s.otf_class.studio.name for s in self.summaries})
+            ),
+            home_studio=SimpleNamespace(studio_name="Downtown", time_zone="America/Denver")
+        )
+
+
+def install():
+    """Make the API's client pool create ``FakeOtf`` clients"""
+    from api.core.pool import client_pool
+    client_pool.client_factory = FakeOtf
+
+
+def _member_override(value):
+    email, _, overrides = value.partition(":")
+    try:
+        settings = dict(item.split("=", 1) for item in overrides.split(","))
+        settings = {name: float(setting) for name, setting in settings.items()}
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected EMAIL:name=value[,name=value], got {value!r}")
+    unknown = set(settings) - {"latency", "error_rate", "login_latency", "login_error_rate"}
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown member settings: {', '.join(sorted(unknown))}")
+    return email, settings
+
+
+def add_arguments(parser):
+    """Add the fake upstream's command line options to ``parser``"""
+    parser.add_argument("--latency", type=float, default=upstream.latency, help="Seconds per upstream call")
+    parser.add_argument("--error-rate", type=float, default=upstream.error_rate, help="Upstream failure probability")
+    parser.add_argument("--login-latency", type=float, default=upstream.login_latency, help="Seconds per login")
+    parser.add_argument(
+        "--login-error-rate", type=float, default=upstream.login_error_rate, help="Login failure probability"
+    )
+    parser.add_argument("--history", type=int, nargs="+", default=upstream.history_sizes, help="Workouts per member")
+    parser.add_argument(
+        "--member", type=_member_override, action="append", default=[], metavar="EMAIL:NAME=VALUE[,...]",
+        help="Per-member override, e.g. load3@example.com:latency=2,error_rate=0.1"
+    )
+
+
+def configure(args):
+    """Apply options added by ``add_arguments`` to the fake upstream"""
+    upstream.latency, upstream.error_rate = args.latency, args.error_rate
+    upstream.login_latency, upstream.login_error_rate = args.login_latency, args.login_error_rate
+    upstream.history_sizes = args.history
+    upstream.members = dict(args.member)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the API on top of a simulated OTF upstream")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    from api.main import app
+    configure(args)
+    install()
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
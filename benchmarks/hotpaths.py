@@ -0,0 +1,180 @@
+"""Time the data-shaping hot paths on synthetic histories.
+
+Run with ``python -m benchmarks.hotpaths``. Results and failing cases are
+written as JSON (``--output``); pass an earlier result file as
+``--baseline`` to exit non-zero when any baseline case got slower than
+``--threshold`` allows, failed or didn't run.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+import types
+from types import SimpleNamespace
+import pandas as pd
+from api.core.analytics import WorkoutColumns
+from api.core.records import combine_summaries, order_key, workout_to_dict
+from api.core.store import WorkoutStore
+from api.core.trends import compute_trends
+from benchmarks.synthetic import make_records, make_summaries
+
+SIZES = (100, 1000, 5000, 20000)
+MEMBER = "bench@example.com"
+TOTALS = {"in_studio": 0, "ot_live": 0}
+
+
+def _legacy_modules():
+    """The ``zz_src_old`` analyzer and processor, or None when their imports are unavailable"""
+    # The legacy code imports itself as the ``src`` package
+    if "src" not in sys.modules:
+        package = types.ModuleType("src")
+        package.__path__ = [os.path.join(os.path.dirname(os.path.dirname(__file__)), "zz_src_old")]
+        sys.modules["src"] = package
+    try:
+        from src.analyzer import OTFAnalytics
+        from src.data_processor import OTFDataProcessor
+    except ImportError as e:
+        print(f"Skipping zz_src_old cases: {e}")
+        return None
+    return OTFAnalytics, OTFDataProcessor
+
+
+def _per_row_frame(processor, summaries):
+    """The per-workout dict pipeline that ``build_performance_frame`` replaces"""
+    df = pd.DataFrame([
+        {
+            "date": s.otf_class.starts_at_local,
+            "studio": s.otf_class.studio.name,
+            "calories": s.details.calories_burned,
+            "splat_points": s.details.splat_points,
+            **processor.process_heart_rate_data(s.details),
+            **processor.process_equipment_data(s.details)
+        }
+        for s in summaries
+    ])
+    df["date"] = pd.to_datetime(df["date"])
+    df["weekday"] = df["date"].dt.day_name()
+    return df
+
+
+def _cases(size, store, legacy):
+    """Yield ``(name, fn)`` pairs timed for one history size"""
+    summaries = make_summaries(size)
+    records = make_records(size)
+
+    yield "workout_records", lambda: sorted(
+        (workout_to_dict(w) for w in combine_summaries(SimpleNamespace(summaries=summaries))),
+        key=order_key, reverse=True
+    )
+    yield "trends", lambda: compute_trends(WorkoutColumns.from_records(records))
+
+    if legacy:
+        OTFAnalytics, OTFDataProcessor = legacy
+        # analyze_studio_patterns doesn't touch the client, so skip the login
+        analytics = OTFAnalytics.__new__(OTFAnalytics)
+        yield "studio_patterns", lambda: analytics.analyze_studio_patterns(summaries)
+        yield "extract_per_row", lambda: _per_row_frame(OTFDataProcessor, summaries)
+        yield "extract_batch", lambda: OTFDataProcessor.build_performance_frame(summaries)
+        perf_df = OTFDataProcessor.build_performance_frame(summaries)
+        yield "rollups_resample", lambda: (
+            OTFDataProcessor.calculate_weekly_stats(perf_df), OTFDataProcessor.calculate_monthly_stats(perf_df)
+        )
+
+    yield "rollups_full_sync", lambda: store.save(MEMBER, records, TOTALS, time.time(), replace=True)
+    yield "rollups_delta_sync", lambda: store.save(MEMBER, records[:5], TOTALS, time.time())
+    yield "rollups_read", lambda: (store.rollups(MEMBER, "weekly"), store.rollups(MEMBER, "monthly"))
+
+
+def _time(fn, repeat):
+    """Best per-call time over ``repeat`` runs of an auto-ranged loop"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(sizes, repeat=3, only=None):
+    """Time every case; returns ``(results, failures)`` keyed by case then size"""
+    legacy = _legacy_modules()
+    results = {}
+    failures = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            store = WorkoutStore(os.path.join(directory, f"bench-{size}.db"))
+            store.save(MEMBER, make_records(size), TOTALS, time.time(), replace=True)
+            for name, fn in _cases(size, store, legacy):
+                if only and name not in only:
+                    continue
+                try:
+                    seconds = _time(fn, repeat)
+                except Exception as e:
+                    print(f"{name:>20} {size:>6}  failed: {e}")
+                    failures.setdefault(name, {})[str(size)] = f"{type(e).__name__}: {e}"
+                    continue
+                results.setdefault(name, {})[str(size)] = seconds
+                print(f"{name:>20} {size:>6}  {seconds * 1000:>10.3f} ms")
+            store.close()
+    return results, failures
+
+
+def compare(results, baseline, threshold, sizes, only=None):
+    """Regressions against ``baseline``: ``(name, size, before, after)`` tuples.
+
+    ``after`` is None when a baseline case for one of ``sizes`` failed or
+    didn't run, so a case that starts failing doesn't pass the check.
+    """
+    regressions = []
+    for name, timings in baseline.items():
+        if only and name not in only:
+            continue
+        for size, before in timings.items():
+            if int(size) not in sizes:
+                continue
+            seconds = results.get(name, {}).get(size)
+            if seconds is None or seconds > before * (1 + threshold):
+                regressions.append((name, size, before, seconds))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--cases", nargs="+", help="Only run these cases")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="Earlier result file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown, 0.25 = 25%%")
+    args = parser.parse_args(argv)
+
+    results, failures = run(args.sizes, repeat=args.repeat, only=args.cases)
+    with open(args.output, "w") as f:
+        json.dump({
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+            "failures": failures
+        }, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold, args.sizes, only=args.cases)
+        for name, size, before, after in regressions:
+            if after is None:
+                error = failures.get(name, {}).get(size, "did not run")
+                print(f"REGRESSION {name} @ {size}: {before * 1000:.3f} ms -> failed ({error})")
+            else:
+                print(f"REGRESSION {name} @ {size}: {before * 1000:.3f} ms -> {after * 1000:.3f} ms")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
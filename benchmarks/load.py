@@ -0,0 +1,159 @@
+"""Drive the API with concurrent simulated members.
+
+Run with ``python -m benchmarks.load``. By default the app runs in-process
+on top of ``benchmarks.fake_otf``; pass ``--url`` to load a server started
+with ``python -m benchmarks.fake_otf`` instead. Each concurrency level
+logs its members in, then loops over ``/api/total-classes`` and
+``/api/member-detail`` for ``--duration`` seconds and reports p50/p95/p99
+latency and throughput per endpoint.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+from collections import defaultdict
+import httpx
+import numpy as np
+from benchmarks import fake_otf
+
+LEVELS = (1, 8, 32, 128)
+ENDPOINTS = ("/api/total-classes", "/api/member-detail")
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def timed(self, name, request):
+        started = time.perf_counter()
+        try:
+            response = await request
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            response, ok = None, False
+        self.latencies[name].append(time.perf_counter() - started)
+        if not ok:
+            self.errors[name] += 1
+        return response if ok else None
+
+    def report(self, elapsed):
+        rows = {}
+        for name, latencies in self.latencies.items():
+            p50, p95, p99 = np.percentile(latencies, (50, 95, 99)) * 1000
+            rows[name] = {
+                "requests": len(latencies),
+                "errors": self.errors[name],
+                "throughput": len(latencies) / elapsed,
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99)
+            }
+        return rows
+
+
+async def _member(client, index, deadline, refresh_rate, recorder, rng):
+    email = f"load{index}@example.com"
+    response = await recorder.timed("login", client.post("/api/login", json={"email": email, "password": "load"}))
+    if response is None:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    while time.perf_counter() < deadline:
+        for endpoint in ENDPOINTS:
+            params = {"refresh": "true"} if rng.random() < refresh_rate else None
+            await recorder.timed(endpoint, client.get(endpoint, headers=headers, params=params))
+
+
+async def run_level(client, concurrency, duration, refresh_rate, offset):
+    """Run ``concurrency`` members at once; returns per-endpoint stats"""
+    recorder = Recorder()
+    rng = np.random.default_rng(concurrency)
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _member(client, offset + i, started + duration, refresh_rate, recorder, rng)
+        for i in range(concurrency)
+    ))
+    return recorder.report(time.perf_counter() - started)
+
+
+async def _serve_in_process():
+    """Start the app with uvicorn on a free local port; returns ``(server, task, url)``.
+
+    A real server (rather than an ASGI transport) sends responses before
+    running background tasks, so login timings match production.
+    """
+    import uvicorn
+    from api.main import app
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server, task, f"http://127.0.0.1:{port}"
+
+
+async def run(levels, duration, refresh_rate, url=None):
+    results = {}
+    server = None
+    if url is None:
+        server, task, url = await _serve_in_process()
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(base_url=url, timeout=60, limits=limits) as client:
+        offset = 0
+        for concurrency in levels:
+            # Fresh members per level so each level starts with a login and cold caches
+            results[concurrency] = await run_level(client, concurrency, duration, refresh_rate, offset)
+            offset += concurrency
+            print(f"\nconcurrency {concurrency}")
+            print(f"{'endpoint':>20} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+            for name, row in results[concurrency].items():
+                print(
+                    f"{name:>20} {row['requests']:>8} {row['errors']:>6} {row['throughput']:>8.1f} "
+                    f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}"
+                )
+    if server is not None:
+        server.should_exit = True
+        await task
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the API against a simulated OTF upstream")
+    parser.add_argument("--url", help="Base URL of a running server; default runs the app in-process")
+    parser.add_argument("--levels", type=int, nargs="+", default=LEVELS)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument("--refresh-rate", type=float, default=0.0, help="Fraction of requests forcing a sync")
+    fake_otf.add_arguments(parser)
+    parser.add_argument("--output", help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    if not args.url:
+        # Keep the in-process app's stores out of the working directory
+        directory = tempfile.mkdtemp(prefix="otf-load-")
+        os.environ.setdefault("WORKOUT_DB_PATH", os.path.join(directory, "workouts.db"))
+        os.environ.setdefault("SHARED_CACHE_PATH", os.path.join(directory, "cache.db"))
+        fake_otf.configure(args)
+        fake_otf.install()
+
+    results = asyncio.run(run(args.levels, args.duration, args.refresh_rate, args.url))
+    if not args.url:
+        upstream = fake_otf.upstream
+        print(
+            f"\nupstream calls: {upstream.calls}, simulated errors: {upstream.errors}, "
+            f"logins: {upstream.logins}, simulated login errors: {upstream.login_errors}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({str(level): rows for level, rows in results.items()}, f, indent=2)
+        print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
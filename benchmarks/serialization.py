@@ -0,0 +1,58 @@
+"""Compare encoding paths for the /api/total-classes payload.
+
+Run with ``python -m benchmarks.serialization``.
+"""
+import json
+import timeit
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from api.models.schemas import TotalClassesResponse
+from benchmarks.synthetic import make_records
+
+SIZES = (100, 1000, 5000)
+
+
+def _payload(records):
+    return {
+        "performance_data": {"retrieved_workouts": len(records), "workouts": records, "next_cursor": None},
+        "total_classes": {"in_studio": len(records), "ot_live": 0, "total": len(records)},
+        "date_range": {"first_class": records[-1]["date"], "last_class": records[0]["date"]},
+        "status": "success"
+    }
+
+
+def fastapi_default(payload):
+    """What FastAPI does for a returned dict: jsonable_encoder then stdlib json"""
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode()
+
+
+_adapter = TypeAdapter(TotalClassesResponse)
+
+
+def pydantic_typed(payload):
+    """Validate into the typed response model and dump with pydantic-core"""
+    return _adapter.dump_json(_adapter.validate_python(payload))
+
+
+def orjson_direct(payload):
+    """The API's path: orjson straight from the cached records"""
+    return orjson.dumps(payload)
+
+
+def main():
+    encoders = (fastapi_default, pydantic_typed, orjson_direct)
+    print(f"{'workouts':>8}  " + "  ".join(f"{encoder.__name__:>16}" for encoder in encoders) + "   speedup")
+    for size in SIZES:
+        payload = _payload(make_records(size))
+        assert orjson.loads(orjson_direct(payload)) == json.loads(fastapi_default(payload))
+        number = max(1, 20000 // size)
+        timings = [timeit.timeit(lambda: encoder(payload), number=number) / number for encoder in encoders]
+        cells = "  ".join(f"{seconds * 1000:>13.2f} ms" for seconds in timings)
+        print(f"{size:>8}  {cells}   {timings[0] / timings[-1]:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
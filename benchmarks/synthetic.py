@@ -0,0 +1,67 @@
+"""Synthetic workout histories for benchmarks"""
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+CLASS_NAMES = ["Orange 60", "Orange 3G", "Strength 50", "Tread 50", "Orange 90"]
+COACHES = ["Sam", "Alex", "Jordan", "Riley", "Casey", "Morgan"]
+STUDIOS = ["Downtown", "Uptown", "Riverside", "Lakeview"]
+
+
+def make_records(count, seed=0):
+    """Normalized workout records, newest first, as the API caches them"""
+    rng = random.Random(seed)
+    start = datetime(2015, 1, 1, 6, 0)
+    records = []
+    day = 0
+    for i in range(count):
+        day += rng.choice((1, 1, 2, 3))
+        zones = [rng.randint(0, 5), rng.randint(0, 15), rng.randint(5, 30), rng.randint(5, 25), rng.randint(0, 8)]
+        records.append({
+            "id": f"w{i:06d}",
+            "class_name": rng.choice(CLASS_NAMES),
+            "class_type": "ORANGE_60",
+            "date": (start + timedelta(days=day)).isoformat(),
+            "coach": rng.choice(COACHES),
+            "studio": rng.choice(STUDIOS),
+            "calories_burned": rng.randint(350, 900),
+            "splat_points": rng.randint(5, 40),
+            "active_time": rng.randint(2800, 3700),
+            "zone_time": dict(zip(("gray", "blue", "green", "orange", "red"), zones))
+        })
+    records.reverse()
+    return records
+
+
+def make_summaries(count, seed=0):
+    """Performance summaries shaped like ``otf_api`` responses, newest first.
+
+    Each summary carries the fields the API normalizes plus the equipment
+    data the ``zz_src_old`` extractors read.
+    """
+    ns = SimpleNamespace
+    summaries = []
+    for record in make_records(count, seed):
+        rng = random.Random(record["id"])
+        display = lambda low, high: ns(display_value=f"{rng.uniform(low, high):.2f}")
+        summaries.append(ns(
+            id=record["id"],
+            otf_class=ns(
+                name=record["class_name"],
+                type=record["class_type"],
+                starts_at_local=record["date"],
+                coach=ns(first_name=record["coach"]),
+                studio=ns(name=record["studio"])
+            ),
+            details=ns(
+                calories_burned=record["calories_burned"],
+                splat_points=record["splat_points"],
+                active_time_seconds=record["active_time"],
+                zone_time_minutes=ns(**record["zone_time"]),
+                equipment_data=ns(
+                    treadmill=ns(total_distance=display(1, 3), max_speed=display(5, 10), avg_speed=display(3, 6)),
+                    rower=ns(total_distance=display(200, 1500))
+                )
+            )
+        ))
+    return summaries
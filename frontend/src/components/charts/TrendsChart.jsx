@@ -14,47 +14,24 @@ import {
 // Register Chart.js components
 ChartJS.register(CategoryScale, LinearScale, PointElement, LineElement, Title, Tooltip, Legend);
 
-const TrendsChart = ({ workoutData }) => {
-  if (!workoutData || workoutData.length === 0) return <p className="text-slate-400 text-center">No workout data available.</p>;
+// Daily and weekly buckets are ISO dates (YYYY-MM-DD); monthly ones are YYYY-MM
+const formatBucket = (bucket, timeFrame) =>
+  timeFrame === "monthly" ? bucket : new Date(`${bucket}T00:00:00`).toLocaleDateString();
 
+const TrendsChart = ({ series }) => {
   // 🛠️ State for Toggle (Daily, Weekly, Monthly)
   const [timeFrame, setTimeFrame] = useState("daily");
 
-  // 📊 Aggregated Data Processing (useMemo for performance)
-  const processedData = useMemo(() => {
-    const aggregateData = (interval) => {
-      const grouped = {};
-      
-      workoutData.forEach((workout) => {
-        const date = new Date(workout.date);
-        let key = date.toLocaleDateString(); // Default to daily
+  // 📊 Buckets are aggregated server-side by /api/trends; only format labels here
+  const processedData = useMemo(() => (
+    (series?.[timeFrame] || []).map((bucket) => ({
+      date: formatBucket(bucket.date, timeFrame),
+      avgCalories: bucket.avg_calories,
+      avgSplats: bucket.avg_splats,
+    }))
+  ), [series, timeFrame]);
 
-        if (interval === "weekly") {
-          // Get first day of the week (Sunday-based)
-          const weekStart = new Date(date.setDate(date.getDate() - date.getDay()));
-          key = weekStart.toLocaleDateString();
-        } else if (interval === "monthly") {
-          key = `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, "0")}`; // YYYY-MM format
-        }
-
-        if (!grouped[key]) {
-          grouped[key] = { totalCalories: 0, totalSplats: 0, count: 0 };
-        }
-
-        grouped[key].totalCalories += workout.calories_burned;
-        grouped[key].totalSplats += workout.splat_points;
-        grouped[key].count += 1;
-      });
-
-      return Object.entries(grouped).map(([key, value]) => ({
-        date: key,
-        avgCalories: (value.totalCalories / value.count).toFixed(1),
-        avgSplats: (value.totalSplats / value.count).toFixed(1),
-      }));
-    };
-
-    return aggregateData(timeFrame);
-  }, [workoutData, timeFrame]);
+  if (!series || series.daily.length === 0) return <p className="text-slate-400 text-center">No workout data available.</p>;
 
   // 🎨 Chart Data Preparation
   const labels = processedData.map((d) => d.date);
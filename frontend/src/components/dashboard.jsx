@@ -64,8 +64,9 @@ const Dashboard = ({ onLogout }) => {
   const [error, setError] = useState(null);
   const [status, setStatus] = useState('');
   const [memberInfo, setMemberInfo] = useState(null);
+  const [trends, setTrends] = useState(null);
 
-  const fetchAllData = useCallback(async () => {
+  const fetchAllData = useCallback(async (refresh = false) => {
     try {
       const token = localStorage.getItem('authToken') || sessionStorage.getItem('authToken');
       
@@ -76,29 +77,33 @@ const Dashboard = ({ onLogout }) => {
       setLoading(true);
       setError(null);
   
-      const [classResponse, memberResponse] = await Promise.all([
-        fetch('http://localhost:8000/api/total-classes', {
+      const [classResponse, memberResponse, trendsResponse] = await Promise.all([
+        fetch(`http://localhost:8000/api/total-classes${refresh ? '?refresh=true' : ''}`, {
           headers: { 'Authorization': `Bearer ${token}` }
         }),
         fetch('http://localhost:8000/api/member-detail', {
           headers: { 'Authorization': `Bearer ${token}` }
+        }),
+        fetch(`http://localhost:8000/api/trends${refresh ? '?refresh=true' : ''}`, {
+          headers: { 'Authorization': `Bearer ${token}` }
         })
       ]);
   
-      if (classResponse.status === 401 || memberResponse.status === 401) {
+      if (classResponse.status === 401 || memberResponse.status === 401 || trendsResponse.status === 401) {
         localStorage.removeItem('authToken');
         sessionStorage.removeItem('authToken');
         onLogout?.();
         throw new Error('Session expired. Please login again.');
       }
   
-      if (!classResponse.ok || !memberResponse.ok) {
+      if (!classResponse.ok || !memberResponse.ok || !trendsResponse.ok) {
         throw new Error('Failed to fetch data');
       }
   
-      const [classData, memberData] = await Promise.all([
+      const [classData, memberData, trendsData] = await Promise.all([
         classResponse.json(),
-        memberResponse.json()
+        memberResponse.json(),
+        trendsResponse.json()
       ]);
   
       console.log("Workout Data:", classData.performance_data.workouts); // Log full workout data
@@ -112,6 +117,7 @@ const Dashboard = ({ onLogout }) => {
       });
   
       setMemberInfo(memberData.data);
+      setTrends(trendsData.data); // Aggregated server-side from the same history
       setStatus(classData.status);
   
       if (classData.status === 'partial_success') {
@@ -133,7 +139,7 @@ const Dashboard = ({ onLogout }) => {
   }, [fetchAllData]);
 
   const handleRefresh = () => {
-    fetchAllData();
+    fetchAllData(true); // Bypass the server-side history cache
   };
 
   const tabs = [
@@ -290,8 +296,8 @@ const Dashboard = ({ onLogout }) => {
   {activeTab === 'workouts' && (
     <WorkoutsTab classData={classData} />
   )}
-{activeTab === 'trends' && classData?.workouts?.length > 0 && (
-  <TrendsTab workoutData={classData.workouts} />
+{activeTab === 'trends' && trends?.total_workouts > 0 && (
+  <TrendsTab trends={trends} />
 )}
 </div>
         </div>
@@ -6,113 +6,31 @@ import { QuestionMarkCircleIcon } from '@heroicons/react/24/outline';
 
 /**
  * 📌 **TrendsTab Component**
- * - Analyzes and displays **workout trends** over time.
+ * - Displays **workout trends** over time.
  * - Shows **total workouts, averages, best performing days**, and **personal records (PRs)**.
+ * - All aggregates come pre-computed from `/api/trends`, so nothing is reduced in the browser.
  */
-const TrendsTab = ({ workoutData }) => {
-  // ✅ Ensure data is available before processing
-  const hasData = workoutData && workoutData.length > 0;
-
+const TrendsTab = ({ trends: serverTrends }) => {
   /**
-   * 🧠 **Compute Workout Trends Efficiently**
-   * - Uses `useMemo` to **optimize performance** by memoizing calculations.
+   * 🧠 **Map server aggregates to display values**
+   * - `useMemo` keeps the mapping stable across re-renders.
    */
   const trends = useMemo(() => {
-    if (!hasData) return null;
-
-    // 🔢 Aggregate Workout Stats
-    const totalWorkouts = workoutData.length;
-    const totalCalories = workoutData.reduce((sum, w) => sum + (w.calories_burned || 0), 0);
-    const totalSplats = workoutData.reduce((sum, w) => sum + (w.splat_points || 0), 0);
-    const avgCalories = totalWorkouts > 0 ? (totalCalories / totalWorkouts).toFixed(1) : 0;
-    const avgSplats = totalWorkouts > 0 ? (totalSplats / totalWorkouts).toFixed(1) : 0;
-
-    // 📅 **Best Performing Day Calculation** (Based on Avg Calories Burned)
-    const dayPerformance = workoutData.reduce((acc, workout) => {
-      const day = new Date(workout.date).toLocaleDateString("en-US", { weekday: "long" });
-
-      if (!acc[day]) {
-        acc[day] = { totalCalories: 0, count: 0 };
-      }
-
-      acc[day].totalCalories += workout.calories_burned || 0;
-      acc[day].count += 1;
-      return acc;
-    }, {});
-
-    // 🏆 Determine the best-performing day
-    const bestDay = Object.keys(dayPerformance).reduce((best, current) => {
-      const bestAvg = dayPerformance[best]?.count > 0 ? dayPerformance[best].totalCalories / dayPerformance[best].count : 0;
-      const currentAvg = dayPerformance[current]?.count > 0 ? dayPerformance[current].totalCalories / dayPerformance[current].count : 0;
-      return currentAvg > bestAvg ? current : best;
-    }, "Unknown"); // ✅ Default to "Unknown" if no valid data
-
-    // 🏅 **Personal Records (PRs)**
-    const highestCalories = Math.max(...workoutData.map(w => w.calories_burned || 0));
-    const highestSplats = Math.max(...workoutData.map(w => w.splat_points || 0));
-
-    // 🔥 **Class Type Performance Breakdown**
-    const classPerformance = workoutData.reduce((acc, workout) => {
-      if (!acc[workout.class_name]) {
-        acc[workout.class_name] = { totalCalories: 0, totalSplats: 0, count: 0 };
-      }
-
-      acc[workout.class_name].totalCalories += workout.calories_burned || 0;
-      acc[workout.class_name].totalSplats += workout.splat_points || 0;
-      acc[workout.class_name].count += 1;
-      return acc;
-    }, {});
-
-    // 🔥 **Streak Tracking**
-    let currentStreak = 0, longestStreak = 0, hrmStreak = 0;
-    let lastWorkoutDate = null, tempStreak = 0, tempHRMStreak = 0;
-
-    workoutData
-      .sort((a, b) => new Date(a.date) - new Date(b.date))
-      .forEach((workout) => {
-        const workoutDate = new Date(workout.date).setHours(0, 0, 0, 0);
-        
-        if (lastWorkoutDate) {
-          const diff = (workoutDate - lastWorkoutDate) / (1000 * 60 * 60 * 24);
-          
-          if (diff === 1) {
-            tempStreak++;
-          } else {
-            longestStreak = Math.max(longestStreak, tempStreak);
-            tempStreak = 1;
-          }
-
-          if (workout.calories_burned > 0) {
-            tempHRMStreak++;
-          } else {
-            hrmStreak = Math.max(hrmStreak, tempHRMStreak);
-            tempHRMStreak = 0;
-          }
-        } else {
-          tempStreak = 1;
-          tempHRMStreak = workout.calories_burned > 0 ? 1 : 0;
-        }
-
-        lastWorkoutDate = workoutDate;
-      });
-
-    longestStreak = Math.max(longestStreak, tempStreak);
-    hrmStreak = Math.max(hrmStreak, tempHRMStreak);
-    currentStreak = tempStreak;
+    if (!serverTrends) return null;
 
     return {
-      totalWorkouts,
-      avgCalories,
-      avgSplats,
-      bestDay,
-      highestCalories,
-      highestSplats,
-      classPerformance,
-      currentStreak,
-      longestStreak,
-      hrmStreak
+      totalWorkouts: serverTrends.total_workouts,
+      avgCalories: serverTrends.avg_calories.toFixed(1),
+      avgSplats: serverTrends.avg_splats.toFixed(1),
+      bestDay: serverTrends.best_day,
+      highestCalories: serverTrends.highest_calories,
+      highestSplats: serverTrends.highest_splats,
+      classPerformance: serverTrends.class_performance,
+      currentStreak: serverTrends.current_streak,
+      longestStreak: serverTrends.longest_streak,
+      hrmStreak: serverTrends.hrm_streak
     };
-  }, [workoutData]);
+  }, [serverTrends]);
 
   return (
     <div className="space-y-6">
@@ -160,7 +78,7 @@ const TrendsTab = ({ workoutData }) => {
       </div>
 
       {/* 📈 Workout Trends Chart */}
-      <TrendsChart workoutData={workoutData} />
+      <TrendsChart series={serverTrends?.series} />
 
       <div className="p-6 bg-slate-800/50 rounded-lg shadow-md border border-slate-700/50">
   <h3 className="text-lg font-semibold text-orange-400 mb-3">Performance by Class Type</h3>
@@ -182,10 +100,10 @@ const TrendsTab = ({ workoutData }) => {
             } hover:bg-slate-800/70 transition-all`}>
               <td className="px-4 py-3">{className}</td>
               <td className="px-4 py-3 text-center text-red-400">
-                {(stats.totalCalories / stats.count).toFixed(1)} kcal
+                {stats.avg_calories.toFixed(1)} kcal
               </td>
               <td className="px-4 py-3 text-center text-orange-400">
-                {(stats.totalSplats / stats.count).toFixed(1)}
+                {stats.avg_splats.toFixed(1)}
               </td>
             </tr>
           ))}
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+from api.core.encoding import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, NDJSON_MEDIA_TYPE, negotiate_coding, negotiate_media_type
+
+_OFFERS = (NDJSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE)
+
+
+def _request(accept="", accept_encoding=""):
+    return SimpleNamespace(headers={"accept": accept, "accept-encoding": accept_encoding})
+
+
+def _media_type(accept, offers=_OFFERS):
+    return negotiate_media_type(_request(accept), offers=offers)
+
+
+def test_media_type_follows_q_values():
+    assert _media_type("") == JSON_MEDIA_TYPE
+    assert _media_type("*/*") == JSON_MEDIA_TYPE
+    assert _media_type(NDJSON_MEDIA_TYPE) == NDJSON_MEDIA_TYPE
+    assert _media_type(f"application/json, {NDJSON_MEDIA_TYPE};q=0") == JSON_MEDIA_TYPE
+    assert _media_type(f"application/json, {NDJSON_MEDIA_TYPE};q=0.5") == JSON_MEDIA_TYPE
+    assert _media_type(f"application/json;q=0.5, {NDJSON_MEDIA_TYPE}") == NDJSON_MEDIA_TYPE
+    assert _media_type("application/x-msgpack, application/json") == MSGPACK_MEDIA_TYPE
+    assert _media_type(f"{MSGPACK_MEDIA_TYPE}, {NDJSON_MEDIA_TYPE}") == NDJSON_MEDIA_TYPE
+
+
+def test_media_type_only_uses_offered_types():
+    assert _media_type(NDJSON_MEDIA_TYPE, offers=(MSGPACK_MEDIA_TYPE,)) == JSON_MEDIA_TYPE
+    assert _media_type(MSGPACK_MEDIA_TYPE, offers=()) == JSON_MEDIA_TYPE
+
+
+def _coding(accept_encoding):
+    return negotiate_coding(_request(accept_encoding=accept_encoding))
+
+
+def test_coding_follows_q_values():
+    assert _coding("") == (None, True)
+    assert _coding("gzip, br") == ("br", True)
+    assert _coding("gzip;q=1, br;q=0.1") == ("gzip", True)
+    assert _coding("br;q=0, gzip") == ("gzip", True)
+    assert _coding("gzip;q=0.5, identity") == (None, True)
+    assert _coding("deflate") == (None, True)
+
+
+def test_coding_wildcard_and_identity():
+    assert _coding("*") == ("br", True)
+    assert _coding("br;q=0.5, *") == ("gzip", True)
+    assert _coding("gzip, identity;q=0") == ("gzip", False)
+    assert _coding("*;q=0") == (None, False)
+    assert _coding("*;q=0, identity") == (None, True)
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from api.core.scheduler import BACKGROUND, INTERACTIVE, UpstreamScheduler, upstream_priority
+
+
+def _scheduler(**limits):
+    return UpstreamScheduler(**{"rate": 1000, "burst": 1000, "max_concurrency": 1, "member_concurrency": 1, **limits})
+
+
+async def _occupy(scheduler, member="blocker"):
+    """Hold one slot until the returned event is set"""
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def hold():
+        started.set()
+        await release.wait()
+
+    task = asyncio.create_task(scheduler.call(member, hold))
+    await started.wait()
+    return release, task
+
+
+def _queue(scheduler, order, member, tag, priority=None):
+    async def record():
+        order.append(tag)
+    return asyncio.create_task(scheduler.call(member, record, priority=priority))
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_admits_by_priority_then_arrival():
+    async def scenario():
+        scheduler, order = _scheduler(), []
+        release, blocker = await _occupy(scheduler)
+        tasks = [
+            _queue(scheduler, order, "a", "background-1", BACKGROUND),
+            _queue(scheduler, order, "b", "interactive-1", INTERACTIVE),
+            _queue(scheduler, order, "c", "background-2", BACKGROUND),
+            _queue(scheduler, order, "d", "interactive-2", INTERACTIVE),
+        ]
+        await _settle()
+        assert order == []
+        release.set()
+        await asyncio.gather(blocker, *tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["interactive-1", "interactive-2", "background-1", "background-2"]
+
+
+def test_member_cap_does_not_block_other_members():
+    async def scenario():
+        scheduler, order = _scheduler(max_concurrency=2), []
+        release, blocker = await _occupy(scheduler, member="a")
+        same_member = _queue(scheduler, order, "a", "a-2")
+        other_member = _queue(scheduler, order, "b", "b-1")
+        await other_member
+        assert order == ["b-1"]  # Admitted while member a is still at its cap
+        release.set()
+        await asyncio.gather(blocker, same_member)
+        return order
+
+    assert asyncio.run(scenario()) == ["b-1", "a-2"]
+
+
+def test_cancelled_calls_release_their_slots():
+    async def scenario():
+        scheduler, order = _scheduler(), []
+        release, blocker = await _occupy(scheduler)
+        waiting = _queue(scheduler, order, "a", "cancelled")
+        following = _queue(scheduler, order, "b", "following")
+        await _settle()
+        waiting.cancel()
+        release.set()
+        await asyncio.gather(blocker, following)
+
+        # Cancelled while running
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(60)
+
+        running = asyncio.create_task(scheduler.call("c", hang))
+        await started.wait()
+        running.cancel()
+        await asyncio.gather(running, return_exceptions=True)
+        await _queue(scheduler, order, "c", "after")
+        return order, scheduler._active, scheduler._active_by_member
+
+    order, active, active_by_member = asyncio.run(scenario())
+    assert order == ["following", "after"]
+    assert active == 0 and active_by_member == {}
+
+
+def test_expedite_promotes_queued_and_new_calls():
+    async def scenario():
+        scheduler, order = _scheduler(), []
+        release, blocker = await _occupy(scheduler)
+        queued = _queue(scheduler, order, "a", "a-queued", BACKGROUND)
+        other = _queue(scheduler, order, "b", "b-interactive", INTERACTIVE)
+        await _settle()
+        with upstream_priority(INTERACTIVE), scheduler.expedite("a"):
+            with upstream_priority(BACKGROUND):
+                new = _queue(scheduler, order, "a", "a-new")
+            await _settle()
+            release.set()
+            await asyncio.gather(blocker, queued, other, new)
+        assert "a" not in scheduler._expedited
+        return order
+
+    # a-queued arrived before b and now shares its priority; a-new arrived after b
+    assert asyncio.run(scenario()) == ["a-queued", "b-interactive", "a-new"]
+
+
+def test_token_bucket_limits_rate():
+    async def scenario():
+        scheduler = _scheduler(rate=20, burst=1, max_concurrency=10, member_concurrency=10)
+
+        async def noop():
+            return time.monotonic()
+
+        started = time.monotonic()
+        times = await asyncio.gather(*(scheduler.call("a", noop) for _ in range(3)))
+        return [t - started for t in times]
+
+    elapsed = asyncio.run(scenario())
+    assert elapsed[0] < 0.03
+    assert elapsed[2] >= 0.09  # Two refills at 20 tokens per second
@@ -0,0 +1,111 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from api.core.store import ROLLUP_PERIODS, WorkoutStore
+from benchmarks.synthetic import make_records
+
+MEMBER = "stream@example.com"
+TOTALS = {"in_studio": 0, "ot_live": 0}
+
+
+def _drain_across_threads(store, executors):
+    """Consume a stream the way ``StreamingResponse`` does, one row per threadpool hop"""
+    records = store.iter_workouts(MEMBER, batch_size=100)
+    rows = []
+    for i in range(10_000):
+        row = executors[i % len(executors)].submit(next, records, None).result()
+        if row is None:
+            return rows
+        rows.append(row)
+    raise AssertionError("stream did not end")
+
+
+def test_iter_workouts_streams_across_threads(tmp_path):
+    store = WorkoutStore(str(tmp_path / "workouts.db"))
+    records = make_records(350)
+    store.save(MEMBER, records, TOTALS, time.time(), replace=True)
+
+    # Batches of 100 rows over three single-thread executors, so every batch is fetched on another thread
+    executors = [ThreadPoolExecutor(max_workers=1) for _ in range(3)]
+    with ThreadPoolExecutor(max_workers=8) as streams:
+        results = list(streams.map(lambda _: _drain_across_threads(store, executors), range(8)))
+    for executor in executors:
+        executor.shutdown()
+    store.close()
+
+    expected = [record["id"] for record in records]
+    for rows in results:
+        assert [row["id"] for row in rows] == expected
+
+
+def _page_all(fetch_page, limit):
+    ids, cursor = [], None
+    while True:
+        page, cursor = fetch_page(cursor, limit)
+        ids.extend(record["id"] for record in page)
+        if cursor is None:
+            return ids
+
+
+def test_paging_keeps_workouts_sharing_a_start_time(tmp_path):
+    from api.core.history import MemberHistory
+    from api.core.records import UNKNOWN_DATE, cursor_for, order_key, parse_cursor
+
+    records = make_records(3)
+    for i in range(4):
+        records.append({**records[0], "id": f"undated{i}", "date": UNKNOWN_DATE})
+    records.sort(key=order_key, reverse=True)
+    history = MemberHistory(records, TOTALS)
+    store = WorkoutStore(str(tmp_path / "workouts.db"))
+    store.save(MEMBER, records, TOTALS, time.time(), replace=True)
+
+    def memory_page(cursor, limit):
+        return history.page(before=parse_cursor(cursor) if cursor else None, limit=limit)
+
+    def store_page(cursor, limit):
+        rows = list(store.iter_workouts(MEMBER, before=parse_cursor(cursor) if cursor else None, limit=limit))
+        return rows, cursor_for(rows[-1]) if len(rows) == limit else None
+
+    expected = [record["id"] for record in records]
+    assert _page_all(memory_page, 2) == expected
+    assert _page_all(store_page, 2) == expected
+    store.close()
+
+
+def test_parse_cursor_rejects_malformed_cursors():
+    from api.core.records import parse_cursor
+
+    assert parse_cursor("2024-01-02T06:00:00|w1") == ("2024-01-02T06:00:00", "w1")
+    assert parse_cursor("2024-01-02T06:00:00") == ("2024-01-02T06:00:00", "")
+    for cursor in ("garbage", "", "|w1", "2024-01-02T06:00:00|", "garbage|w1"):
+        with pytest.raises(ValueError):
+            parse_cursor(cursor)
+
+
+def test_delta_saves_match_full_rollup_rebuild(tmp_path):
+    from api.core.records import UNKNOWN_DATE
+
+    records = make_records(200)
+    records.append({**records[-1], "id": "undated", "date": UNKNOWN_DATE})
+    newest = records[0]["date"]
+    # One sync each, so every save only refreshes the buckets it touches
+    deltas = [
+        [{**records[0], "id": "new", "date": newest.replace(newest[:4], str(int(newest[:4]) + 1), 1)}],
+        [{**records[10], "calories_burned": records[10]["calories_burned"] + 100}],
+        [{**records[50], "date": records[150]["date"]}],  # Moved to another week and month
+        [{**records[100], "date": UNKNOWN_DATE}],          # Lost its start time
+        [{**records[-1], "date": records[20]["date"]}],     # Gained a start time
+    ]
+    incremental = WorkoutStore(str(tmp_path / "incremental.db"))
+    incremental.save(MEMBER, records, TOTALS, time.time(), replace=True)
+    merged = {record["id"]: record for record in records}
+
+    for i, delta in enumerate(deltas):
+        incremental.save(MEMBER, delta, TOTALS, time.time())
+        merged.update((record["id"], record) for record in delta)
+        rebuilt = WorkoutStore(str(tmp_path / f"rebuilt{i}.db"))
+        rebuilt.save(MEMBER, list(merged.values()), TOTALS, time.time(), replace=True)
+        for period in ROLLUP_PERIODS:
+            assert incremental.rollups(MEMBER, period) == rebuilt.rollups(MEMBER, period), (i, period)
+        rebuilt.close()
+    incremental.close()
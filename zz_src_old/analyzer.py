@@ -1,24 +1,89 @@
+import asyncio
 import logging
-from datetime import datetime
+import random
+from datetime import datetime, timedelta
 import pandas as pd
 from otf_api import Otf
 from pydantic import Field
 from fastapi import HTTPException
 from otf_api.models.base import OtfItemBase
+from src.detail_cache import WorkoutDetailCache
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# A class's summary is final once it has been over for a while
+FINISHED_AFTER = timedelta(hours=2)
+
 class TotalClasses(OtfItemBase):
     total_in_studio_classes_attended: int = Field(..., alias="totalInStudioClassesAttended")
     total_otlive_classes_attended: int = Field(..., alias="totalOtliveClassesAttended")
 
+async def fetch_concurrently(items, fetch, concurrency=8, retries=3, backoff=0.5, on_progress=None):
+    """Run ``fetch(item)`` for every item with at most ``concurrency`` calls in flight.
+
+    Each failing call is retried up to ``retries`` times with exponential
+    backoff plus jitter. Results are returned in the order of ``items``, with
+    None for items that failed every attempt. ``on_progress(done, total)`` is
+    called as items finish.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    total = len(items)
+    done = 0
+
+    async def run(item):
+        nonlocal done
+        result = None
+        for attempt in range(retries + 1):
+            try:
+                async with semaphore:
+                    result = await fetch(item)
+                break
+            except Exception as e:
+                if attempt == retries:
+                    logger.warning(f"Giving up on {item!r} after {attempt + 1} attempts: {e}")
+                    break
+                delay = backoff * 2 ** attempt + random.uniform(0, backoff)
+                logger.info(f"Retrying {item!r} in {delay:.1f}s: {e}")
+                # Sleep outside the semaphore so retries don't block other items
+                await asyncio.sleep(delay)
+        done += 1
+        if on_progress:
+            on_progress(done, total)
+        return result
+
+    return await asyncio.gather(*(run(item) for item in items))
+
+
+def is_finished(workout, now=None):
+    """Whether the workout's class is over, so its detail can be cached forever.
+
+    Workouts without a usable start time count as unfinished, so their
+    details are fetched again next time rather than cached.
+    """
+    starts_at = getattr(getattr(workout, "otf_class", None), "starts_at_local", None)
+    if isinstance(starts_at, str):
+        try:
+            starts_at = datetime.fromisoformat(starts_at)
+        except ValueError:
+            return False
+    if not isinstance(starts_at, datetime):
+        return False
+    return starts_at.replace(tzinfo=None) + FINISHED_AFTER <= (now or datetime.now())
+
+
+def _log_progress(done, total):
+    if done == total or done % 25 == 0:
+        logger.info(f"Fetched {done}/{total} workout details")
+
+
 class OTFAnalytics:
-    def __init__(self, email, password):
+    def __init__(self, email, password, detail_cache=None):
         self.email = email
         self.password = password
         self.otf = Otf(email, password)
+        self.detail_cache = detail_cache if detail_cache is not None else WorkoutDetailCache()
 
     async def get_workout_data(self, limit=None):
         """Get detailed workout data"""
@@ -76,18 +141,29 @@ class OTFAnalytics:
             logger.error(f"Error fetching class data: {e}")
             raise HTTPException(status_code=500, detail=f"Error fetching class data: {str(e)}")
 
-    async def analyze_performance(self, workouts):
-        """Analyze detailed performance metrics"""
-        performance_data = []
-        for workout in workouts:
-            try:
-                detail = await self.otf.get_performance_summary(workout.id)
-                performance_data.append(detail)
-            except Exception as e:
-                logger.warning(f"Error processing workout {workout.id}: {e}")
-                continue
+    async def analyze_performance(self, workouts, concurrency=8, retries=3, on_progress=_log_progress):
+        """Analyze detailed performance metrics.
+
+        Details of finished classes come from the detail cache, so only new
+        workouts are fetched. Those are fetched ``concurrency`` at a time.
+        Results are returned in workout order, and workouts whose detail
+        can't be fetched after ``retries`` are skipped.
+        """
+        details = self.detail_cache.get_many(workout.id for workout in workouts)
+        missing = [workout for workout in workouts if workout.id not in details]
+        logger.info(f"{len(details)} workout details cached, fetching {len(missing)}")
 
-        return performance_data
+        fetched = await fetch_concurrently(
+            [workout.id for workout in missing],
+            self.otf.get_performance_summary,
+            concurrency=concurrency,
+            retries=retries,
+            on_progress=on_progress
+        )
+        fetched = [(workout, detail) for workout, detail in zip(missing, fetched) if detail is not None]
+        self.detail_cache.put_many({workout.id: detail for workout, detail in fetched if is_finished(workout)})
+        details.update((workout.id, detail) for workout, detail in fetched)
+        return [details[workout.id] for workout in workouts if workout.id in details]
 
     def analyze_studio_patterns(self, workouts):
         """Analyze studio attendance patterns"""
@@ -116,8 +192,9 @@ class OTFAnalytics:
             raise HTTPException(status_code=500, detail=f"Error analyzing studio patterns: {str(e)}")
 
     async def close(self):
-        """Close the OTF client session"""
+        """Close the OTF client session and the detail cache"""
         try:
             await self.otf.session.close()
         except Exception as e:
-            logger.error(f"Error closing session: {e}")
\ No newline at end of file
+            logger.error(f"Error closing session: {e}")
+        self.detail_cache.close()
\ No newline at end of file
@@ -1,5 +1,17 @@
+import numpy as np
 import pandas as pd
 
+ZONE_COLUMNS = ("red_zone", "orange_zone", "green_zone", "blue_zone", "gray_zone")
+EQUIPMENT_COLUMNS = ("tread_distance", "max_speed", "avg_speed", "rower_distance")
+_ZONES = tuple(column.removesuffix("_zone") for column in ZONE_COLUMNS)
+# Equipment metrics in ``EQUIPMENT_COLUMNS`` order, grouped by machine so each is looked up once
+_EQUIPMENT_METRICS = (
+    ("treadmill", ("total_distance", "max_speed", "avg_speed")),
+    ("rower", ("total_distance",)),
+)
+_NUMERIC_COLUMNS = ("calories", "splat_points") + ZONE_COLUMNS + EQUIPMENT_COLUMNS
+
+
 class OTFDataProcessor:
     @staticmethod
     def print_insights(freq_data, perf_df):
@@ -69,6 +81,50 @@ class OTFDataProcessor:
             print(f"  Avg Distance: {studio_stats.loc[studio, 'tread_distance']:.2f} miles")
 
 
+    @staticmethod
+    def build_performance_frame(workout_details):
+        """Build the analysis DataFrame from a list of workout details in one pass.
+
+        Numeric values are appended to one flat float buffer that becomes a
+        typed 2-D array, and the frame is built in a single constructor call,
+        so no per-workout dicts or column inserts are needed. Columns match
+        what ``process_heart_rate_data`` and ``process_equipment_data``
+        produce, plus ``date``, ``weekday``, ``studio``, ``calories`` and
+        ``splat_points``.
+        """
+        no_zones = (0,) * len(_ZONES)
+        values = []
+        dates = []
+        studios = []
+
+        for workout in workout_details:
+            # Detail responses nest the metrics under ``details``
+            data = getattr(workout, "details", None) or workout
+            otf_class = getattr(workout, "otf_class", None)
+            dates.append(getattr(otf_class, "starts_at_local", None))
+            studios.append(getattr(getattr(otf_class, "studio", None), "name", None) or "Unknown")
+
+            values.append(getattr(data, "calories_burned", 0) or 0)
+            values.append(getattr(data, "splat_points", 0) or 0)
+            zones = getattr(data, "zone_time_minutes", None)
+            values.extend([getattr(zones, zone, 0) or 0 for zone in _ZONES] if zones is not None else no_zones)
+            equip = getattr(data, "equipment_data", None)
+            for equipment, metrics in _EQUIPMENT_METRICS:
+                machine = getattr(equip, equipment, None)
+                for metric in metrics:
+                    value = getattr(machine, metric, None)
+                    values.append(float(value.display_value) if value is not None else 0.0)
+
+        numeric = np.array(values, dtype=np.float64).reshape(len(dates), len(_NUMERIC_COLUMNS))
+        # Parsing with a known format skips per-element format inference
+        dates = pd.to_datetime(dates, format="ISO8601", errors="coerce")
+        return pd.DataFrame({
+            "date": dates,
+            "weekday": dates.day_name(),
+            "studio": studios,
+            **dict(zip(_NUMERIC_COLUMNS, numeric.T))
+        })
+
     @staticmethod
     def process_heart_rate_data(workout_details):
         """Process heart rate zone data from workout details"""
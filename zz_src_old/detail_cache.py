@@ -0,0 +1,66 @@
+import logging
+import pickle
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+class WorkoutDetailCache:
+    """Persistent cache of per-workout performance details keyed by workout id.
+
+    A finished class's summary never changes, so entries have no TTL. The
+    cache lives in a SQLite file so it survives restarts, and the least
+    recently used entries are evicted once it holds more than ``max_entries``.
+    """
+
+    def __init__(self, path="workout_details.db", max_entries=5000):
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS details ("
+            "workout_id TEXT PRIMARY KEY, detail BLOB NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_details_accessed_at ON details (accessed_at)")
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM details").fetchone()[0]
+
+    def get_many(self, workout_ids):
+        """Return ``{workout_id: detail}`` for the ids that are cached"""
+        found = {}
+        ids = list(workout_ids)
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT workout_id, detail FROM details WHERE workout_id IN ({', '.join('?' * len(chunk))})",
+                chunk
+            ).fetchall()
+            for workout_id, blob in rows:
+                try:
+                    found[workout_id] = pickle.loads(blob)
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable cached detail {workout_id}: {e}")
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE details SET accessed_at = ? WHERE workout_id = ?",
+                [(time.time(), workout_id) for workout_id in found]
+            )
+        return found
+
+    def put_many(self, details):
+        """Cache ``{workout_id: detail}`` and evict the least recently used overflow"""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO details (workout_id, detail, accessed_at) VALUES (?, ?, ?)",
+                [(workout_id, pickle.dumps(detail), now) for workout_id, detail in details.items()]
+            )
+            self.conn.execute(
+                "DELETE FROM details WHERE workout_id IN ("
+                "SELECT workout_id FROM details ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def close(self):
+        self.conn.close()
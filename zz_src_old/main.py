@@ -26,8 +26,9 @@ async def main():
 
         print("Analyzing patterns...")
         freq_data = analytics.analyze_frequency(workouts)
-        perf_df = await analytics.analyze_performance(workouts)
-        studio_analysis = analytics.analyze_studio_patterns(perf_df)
+        details = await analytics.analyze_performance(workouts)
+        perf_df = data_processor.build_performance_frame(details)
+        studio_analysis = analytics.analyze_studio_patterns(details)
 
         print("Generating insights...")
         data_processor.print_insights(freq_data, perf_df)
@@ -57,6 +58,7 @@ async def main():
 
     finally:
         await analytics.close()
+        visualizer.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,159 +1,330 @@
-import matplotlib.pyplot as plt
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use("Agg")  # Non-interactive backend, safe in worker processes
+from matplotlib.figure import Figure
 import pandas as pd
-import numpy as np
+
+COLORS = ["#f58220", "#1e88e5", "#43a047", "#e53935", "#5e35b1"]
+DAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+ZONE_COLUMNS = ["red_zone", "orange_zone", "green_zone", "blue_zone", "gray_zone"]
+
+# Bump when chart code changes so cached images are re-rendered
+CHART_VERSION = 1
+
+
+def yearly_overview(classes_per_year):
+    """Classes per year"""
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    classes_per_year.plot(kind="bar", color=COLORS[0], ax=ax)
+    ax.set_title("Classes per Year", fontsize=14, pad=20)
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Number of Classes")
+    ax.grid(True, axis="y", alpha=0.3)
+    return fig
+
+
+def monthly_patterns(classes_per_month):
+    """Classes per month by year"""
+    fig = Figure(figsize=(15, 7))
+    ax = fig.subplots()
+    classes_per_month.plot(kind="bar", stacked=False, ax=ax)
+    ax.set_title("Classes per Month by Year", fontsize=14, pad=20)
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Number of Classes")
+    ax.legend(title="Month", bbox_to_anchor=(1.05, 1), loc="upper left")
+    ax.grid(True, axis="y", alpha=0.3)
+    return fig
+
+
+def performance_dashboard(perf_df):
+    """Splats and calories, zone shares, treadmill distance and speed"""
+    fig = Figure(figsize=(15, 12))
+    axes = fig.subplots(2, 2)
+    fig.suptitle("Performance Dashboard", fontsize=16, y=0.95)
+
+    # Splat Points and Calories
+    perf_df.plot(x="date", y=["splat_points", "calories"], ax=axes[0, 0])
+    axes[0, 0].set_title("Splat Points and Calories")
+    axes[0, 0].grid(True, alpha=0.3)
+    axes[0, 0].set_xlabel("Date")
+
+    # Zone Distribution
+    zone_avgs = perf_df[ZONE_COLUMNS].mean()
+    axes[0, 1].pie(zone_avgs, labels=ZONE_COLUMNS, colors=COLORS, autopct="%1.1f%%")
+    axes[0, 1].set_title("Average Time in Zones")
+
+    # Distance Trends
+    perf_df.plot(x="date", y="tread_distance", ax=axes[1, 0], color=COLORS[2])
+    axes[1, 0].set_title("Treadmill Distance")
+    axes[1, 0].grid(True, alpha=0.3)
+    axes[1, 0].set_xlabel("Date")
+    axes[1, 0].set_ylabel("Miles")
+
+    # Speed Progress
+    perf_df.plot(x="date", y=["max_speed", "avg_speed"], ax=axes[1, 1])
+    axes[1, 1].set_title("Speed Progression")
+    axes[1, 1].grid(True, alpha=0.3)
+    axes[1, 1].set_xlabel("Date")
+    axes[1, 1].set_ylabel("MPH")
+    return fig
+
+
+def day_of_week_analysis(perf_df):
+    """Average splats, calories and distance per weekday"""
+    day_stats = perf_df.groupby("weekday").agg(
+        {"splat_points": "mean", "calories": "mean", "tread_distance": "mean"}
+    ).reindex(DAY_ORDER)
+
+    # Scale calories to fit on same plot
+    day_stats["calories"] = day_stats["calories"] / 10
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    day_stats.plot(kind="bar", width=0.8, ax=ax)
+    ax.set_title("Performance by Day of Week", fontsize=14, pad=20)
+    ax.set_xlabel("Day")
+    ax.set_ylabel("Value")
+    ax.legend(["Splat Points", "Calories (÷10)", "Distance (miles)"])
+    ax.grid(True, axis="y", alpha=0.3)
+    ax.tick_params(axis="x", labelrotation=45)
+    return fig
+
+
+def studio_visits(visits_per_studio):
+    """Total visits by studio"""
+    fig = Figure(figsize=(15, 8))
+    ax = fig.subplots()
+    visits = pd.Series(visits_per_studio)
+    visits.sort_values(ascending=True).plot(kind='barh', color=COLORS[0], ax=ax)
+    ax.set_title('Total Visits by Studio', fontsize=14, pad=20)
+    ax.set_xlabel('Number of Visits')
+    ax.set_ylabel('Studio')
+    ax.grid(True, axis='x', alpha=0.3)
+    return fig
+
+
+def studio_monthly_pattern(monthly_attendance):
+    """Monthly attendance patterns by studio"""
+    fig = Figure(figsize=(15, 8))
+    ax = fig.subplots()
+    monthly_attendance.plot(kind='area', stacked=True, ax=ax)
+    ax.set_title('Monthly Studio Attendance Pattern', fontsize=14, pad=20)
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Number of Visits')
+    ax.legend(title='Studio', bbox_to_anchor=(1.05, 1), loc='upper left')
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+def yearly_studios(yearly_unique_studios):
+    """Unique studios visited per year"""
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    pd.Series(yearly_unique_studios).plot(kind='bar', color=COLORS[1], ax=ax)
+    ax.set_title('Unique Studios Visited per Year', fontsize=14, pad=20)
+    ax.set_xlabel('Year')
+    ax.set_ylabel('Number of Unique Studios')
+    ax.grid(True, axis='y', alpha=0.3)
+    return fig
+
+
+CHARTS = {
+    "yearly_overview": yearly_overview,
+    "monthly_patterns": monthly_patterns,
+    "performance_dashboard": performance_dashboard,
+    "day_of_week_analysis": day_of_week_analysis,
+    "studio_visits": studio_visits,
+    "studio_monthly_pattern": studio_monthly_pattern,
+    "yearly_studios": yearly_studios,
+}
+
+
+def render_chart(name, data, fmt="png"):
+    """Render one chart to image bytes.
+
+    Each call builds its own ``Figure`` with no pyplot state, so charts can
+    render concurrently in separate worker processes.
+    """
+    fig = CHARTS[name](data)
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def _update_digest(digest, value):
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr((list(value.columns), value.dtypes.astype(str).tolist())).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(repr((value.name, str(value.dtype))).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, dict):
+        digest.update(b"dict")
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            _update_digest(digest, value[key])
+    else:
+        digest.update(repr(value).encode())
+
+
+def chart_key(name, data, fmt="png"):
+    """Hash of a chart's input data and rendering parameters"""
+    digest = hashlib.sha256(repr((name, fmt, CHART_VERSION, matplotlib.__version__)).encode())
+    _update_digest(digest, data)
+    return digest.hexdigest()
+
+
+class ChartCache:
+    """Rendered chart images on disk, keyed by ``chart_key``.
+
+    A hit refreshes the file's modification time, and the least recently
+    used images are deleted once more than ``max_entries`` are stored.
+    """
+
+    def __init__(self, directory=".chart_cache", max_entries=200):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                image = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return image
+
+    def put(self, key, image):
+        tmp = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(image)
+        os.replace(tmp, self._path(key))  # Readers never see a partial image
+        self._evict()
+
+    def _evict(self):
+        entries = [entry for entry in os.scandir(self.directory) if not entry.name.endswith(".tmp")]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
 
 class OTFVisualizer:
-    def __init__(self):
-        self.colors = ["#f58220", "#1e88e5", "#43a047", "#e53935", "#5e35b1"]
-        plt.style.use("default")
+    """Renders the analysis charts in parallel on a process pool.
+
+    ``generate_*`` block until every chart file is written, and the
+    ``agenerate_*`` variants await the same work without blocking the event
+    loop. Charts whose input data hasn't changed are copied from the chart
+    cache instead of being re-rendered.
+    """
+
+    def __init__(self, max_workers=None, cache=None):
+        self.colors = COLORS
+        self.max_workers = max_workers
+        self.cache = cache if cache is not None else ChartCache()
+        self._executor = None
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            # Spawned workers don't inherit the caller's threads, event loop or locks
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
 
     def generate_visualizations(self, freq_data, perf_df):
         """Generate all visualizations"""
-        self._generate_yearly_overview(freq_data)
-        self._generate_monthly_patterns(freq_data)
-        self._generate_performance_dashboard(perf_df)
-        self._generate_day_analysis(perf_df)
+        return self._render_files(self._analysis_jobs(freq_data, perf_df))
 
     def generate_studio_visualizations(self, studio_analysis):
         """Generate studio analysis visualizations"""
-        self._generate_studio_visits(studio_analysis)
-        self._generate_studio_monthly_attendance(studio_analysis)
-        self._generate_studio_yearly_analysis(studio_analysis)
+        return self._render_files(self._studio_jobs(studio_analysis))
+
+    async def agenerate_visualizations(self, freq_data, perf_df):
+        return await self._arender_files(self._analysis_jobs(freq_data, perf_df))
+
+    async def agenerate_studio_visualizations(self, studio_analysis):
+        return await self._arender_files(self._studio_jobs(studio_analysis))
 
     def generate_challenge_visualizations(self, challenge_data):
         """Generate challenge-related visualizations"""
         self._generate_benchmark_progress(challenge_data['details'])
         self._generate_challenge_participation(challenge_data['challenges'])
 
-    def _generate_yearly_overview(self, freq_data):
-        """Generate yearly overview visualization"""
-        plt.figure(figsize=(12, 6))
-        freq_data["classes_per_year"].plot(kind="bar", color=self.colors[0])
-        plt.title("Classes per Year", fontsize=14, pad=20)
-        plt.xlabel("Year")
-        plt.ylabel("Number of Classes")
-        plt.grid(True, axis="y", alpha=0.3)
-        plt.tight_layout()
-        plt.savefig("yearly_overview.png")
-        plt.close()
-
-    def _generate_monthly_patterns(self, freq_data):
-        """Generate monthly patterns visualization"""
-        plt.figure(figsize=(15, 7))
-        freq_data["classes_per_month"].plot(kind="bar", stacked=False)
-        plt.title("Classes per Month by Year", fontsize=14, pad=20)
-        plt.xlabel("Year")
-        plt.ylabel("Number of Classes")
-        plt.legend(title="Month", bbox_to_anchor=(1.05, 1), loc="upper left")
-        plt.grid(True, axis="y", alpha=0.3)
-        plt.tight_layout()
-        plt.savefig("monthly_patterns.png")
-        plt.close()
-
-    def _generate_performance_dashboard(self, perf_df):
-        """Generate performance dashboard visualization"""
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-        fig.suptitle("Performance Dashboard", fontsize=16, y=0.95)
-
-        # Splat Points and Calories
-        perf_df.plot(x="date", y=["splat_points", "calories"], ax=axes[0, 0])
-        axes[0, 0].set_title("Splat Points and Calories")
-        axes[0, 0].grid(True, alpha=0.3)
-        axes[0, 0].set_xlabel("Date")
-
-        # Zone Distribution
-        zone_cols = ["red_zone", "orange_zone", "green_zone", "blue_zone", "gray_zone"]
-        zone_avgs = perf_df[zone_cols].mean()
-        axes[0, 1].pie(zone_avgs, labels=zone_cols, colors=self.colors, autopct="%1.1f%%")
-        axes[0, 1].set_title("Average Time in Zones")
-
-        # Distance Trends
-        perf_df.plot(x="date", y="tread_distance", ax=axes[1, 0], color=self.colors[2])
-        axes[1, 0].set_title("Treadmill Distance")
-        axes[1, 0].grid(True, alpha=0.3)
-        axes[1, 0].set_xlabel("Date")
-        axes[1, 0].set_ylabel("Miles")
-
-        # Speed Progress
-        perf_df.plot(x="date", y=["max_speed", "avg_speed"], ax=axes[1, 1])
-        axes[1, 1].set_title("Speed Progression")
-        axes[1, 1].grid(True, alpha=0.3)
-        axes[1, 1].set_xlabel("Date")
-        axes[1, 1].set_ylabel("MPH")
-
-        plt.tight_layout()
-        plt.savefig("performance_dashboard.png")
-        plt.close()
-
-    def _generate_day_analysis(self, perf_df):
-        """Generate day of week analysis visualization"""
-        plt.figure(figsize=(12, 6))
-        day_stats = perf_df.groupby("weekday").agg(
-            {"splat_points": "mean", "calories": "mean", "tread_distance": "mean"}
-        )
-        # Reorder days
-        day_order = [
-            "Monday",
-            "Tuesday",
-            "Wednesday",
-            "Thursday",
-            "Friday",
-            "Saturday",
-            "Sunday",
+    @staticmethod
+    def _analysis_jobs(freq_data, perf_df):
+        # Each chart gets only the data it plots, so its cache key changes only with that data
+        return [
+            ("yearly_overview", freq_data["classes_per_year"], "yearly_overview.png"),
+            ("monthly_patterns", freq_data["classes_per_month"], "monthly_patterns.png"),
+            ("performance_dashboard", perf_df[
+                ["date", "splat_points", "calories", "tread_distance", "max_speed", "avg_speed"] + ZONE_COLUMNS
+            ], "performance_dashboard.png"),
+            ("day_of_week_analysis", perf_df[
+                ["weekday", "splat_points", "calories", "tread_distance"]
+            ], "day_of_week_analysis.png"),
         ]
-        day_stats = day_stats.reindex(day_order)
-
-        # Scale calories to fit on same plot
-        day_stats["calories"] = day_stats["calories"] / 10
-
-        day_stats.plot(kind="bar", width=0.8)
-        plt.title("Performance by Day of Week", fontsize=14, pad=20)
-        plt.xlabel("Day")
-        plt.ylabel("Value")
-        plt.legend(["Splat Points", "Calories (÷10)", "Distance (miles)"])
-        plt.grid(True, axis="y", alpha=0.3)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig("day_of_week_analysis.png")
-        plt.close()
-
-    def _generate_studio_visits(self, studio_analysis):
-        """Generate studio visits visualization"""
-        plt.figure(figsize=(15, 8))
-        visits = pd.Series(studio_analysis['visits_per_studio'])
-        visits.sort_values(ascending=True).plot(kind='barh', color=self.colors[0])
-        plt.title('Total Visits by Studio', fontsize=14, pad=20)
-        plt.xlabel('Number of Visits')
-        plt.ylabel('Studio')
-        plt.grid(True, axis='x', alpha=0.3)
-        plt.tight_layout()
-        plt.savefig('studio_visits.png')
-        plt.close()
-
-    def _generate_studio_monthly_attendance(self, studio_analysis):
-        """Generate monthly attendance patterns by studio"""
+
+    @staticmethod
+    def _studio_jobs(studio_analysis):
+        jobs = [("studio_visits", studio_analysis['visits_per_studio'], "studio_visits.png")]
         if 'monthly_attendance' in studio_analysis:
-            plt.figure(figsize=(15, 8))
-            studio_analysis['monthly_attendance'].plot(kind='area', stacked=True)
-            plt.title('Monthly Studio Attendance Pattern', fontsize=14, pad=20)
-            plt.xlabel('Date')
-            plt.ylabel('Number of Visits')
-            plt.legend(title='Studio', bbox_to_anchor=(1.05, 1), loc='upper left')
-            plt.grid(True, alpha=0.3)
-            plt.tight_layout()
-            plt.savefig('studio_monthly_pattern.png')
-            plt.close()
-
-    def _generate_studio_yearly_analysis(self, studio_analysis):
-        """Generate yearly studio analysis visualization"""
+            jobs.append(("studio_monthly_pattern", studio_analysis['monthly_attendance'], "studio_monthly_pattern.png"))
         if 'yearly_unique_studios' in studio_analysis:
-            plt.figure(figsize=(10, 6))
-            yearly_studios = pd.Series(studio_analysis['yearly_unique_studios'])
-            yearly_studios.plot(kind='bar', color=self.colors[1])
-            plt.title('Unique Studios Visited per Year', fontsize=14, pad=20)
-            plt.xlabel('Year')
-            plt.ylabel('Number of Unique Studios')
-            plt.grid(True, axis='y', alpha=0.3)
-            plt.tight_layout()
-            plt.savefig('yearly_studios.png')
-            plt.close()
+            jobs.append(("yearly_studios", studio_analysis['yearly_unique_studios'], "yearly_studios.png"))
+        return jobs
+
+    def _cached(self, jobs):
+        """Split jobs into cached images and the jobs still to render"""
+        keys = [chart_key(name, data) for name, data, _ in jobs]
+        images = [self.cache.get(key) for key in keys]
+        pending = [i for i, image in enumerate(images) if image is None]
+        return keys, images, pending
+
+    def _finish(self, jobs, keys, images, pending, rendered):
+        for i, image in zip(pending, rendered):
+            self.cache.put(keys[i], image)
+            images[i] = image
+        return [_write(path, image) for (_, _, path), image in zip(jobs, images)]
+
+    def _render_files(self, jobs):
+        keys, images, pending = self._cached(jobs)
+        futures = [self.executor.submit(render_chart, jobs[i][0], jobs[i][1]) for i in pending]
+        return self._finish(jobs, keys, images, pending, [future.result() for future in futures])
+
+    async def _arender_files(self, jobs):
+        loop = asyncio.get_running_loop()
+        keys, images, pending = self._cached(jobs)
+        rendered = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, render_chart, jobs[i][0], jobs[i][1]) for i in pending
+        ))
+        return self._finish(jobs, keys, images, pending, rendered)
+
+    def close(self):
+        """Shut down the rendering processes"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+def _write(path, image):
+    with open(path, "wb") as f:
+        f.write(image)
+    return path